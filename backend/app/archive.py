@@ -0,0 +1,179 @@
+import gzip
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: without it, archived debates are served gzip-encoded only
+    brotli = None
+
+# Persistent archive of finished debates under content-addressed ids.
+# A debate is stored once, with its JSON body pre-compressed, so refreshing or sharing it is one
+# indexed lookup: a 304 when the client already has it, otherwise the stored bytes as they are.
+
+# Fields that make up a debate's content, and so its id; timings and token counts are not part of it
+CONTENT_FIELDS = ("topic", "pro_argument", "con_argument", "mediator_analysis", "summary", "mediator_mode")
+
+ID_LENGTH = 32  # hex characters of the SHA-256 digest
+
+
+def debate_id(debate: dict, intensity: Optional[str] = None) -> str:
+    content = {field: debate.get(field) for field in CONTENT_FIELDS}
+    content["intensity"] = intensity
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:ID_LENGTH]
+
+
+def etag_for(archived_id: str, encoding: Optional[str] = None) -> str:
+    # The id is derived from the content, so it already is a strong validator. Each content coding is a
+    # different representation, though, and a strong validator must tell them apart.
+    if encoding is None or encoding == "identity":
+        return f'"{archived_id}"'
+    return f'"{archived_id}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires: W/"x" matches "x"
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Tuple[str, ...]) -> Optional[str]:
+    """Pick the first of `available` (in preference order) that the Accept-Encoding header allows"""
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    for encoding in available:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+class ArchivedDebate(NamedTuple):
+    id: str
+    created_at: float
+    bodies: Dict[str, bytes]  # content encoding ("identity", "gzip", "br") -> response body
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        return etag_for(self.id, encoding)
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        return tuple(encoding for encoding in ("br", "gzip") if encoding in self.bodies)
+
+
+class DebateArchive:
+    """SQLite store of finished debates, keyed by debate_id()"""
+
+    def __init__(self, path: str, gzip_level: int = 9, brotli_quality: int = 11):
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS debate_archive ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, topic TEXT NOT NULL, intensity TEXT, "
+            "mediator_mode TEXT NOT NULL, created_at REAL NOT NULL, size INTEGER NOT NULL, "
+            "body BLOB NOT NULL, body_gzip BLOB NOT NULL, body_br BLOB)"
+        )
+        self.db.commit()
+        self.stored = 0
+        self.duplicates = 0
+
+    def save(self, debate: dict, intensity: Optional[str] = None) -> str:
+        """Store a debate (a DebateResponse dump) and return its id; storing the same debate again is a no-op"""
+        archived_id = debate_id(debate, intensity)
+        with self.lock:
+            known = self.db.execute("SELECT 1 FROM debate_archive WHERE id = ?", (archived_id,)).fetchone()
+        if known:
+            self.duplicates += 1
+            return archived_id
+        record = dict(debate, id=archived_id, cached=True)
+        body = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode()
+        # Compressed once here, at the highest levels, rather than on every view
+        body_gzip = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        body_br = brotli.compress(body, quality=self.brotli_quality) if brotli is not None else None
+        with self.lock:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO debate_archive "
+                "(id, topic, intensity, mediator_mode, created_at, size, body, body_gzip, body_br) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (archived_id, debate["topic"], intensity, debate.get("mediator_mode", "full"), time.time(),
+                 len(body), body, body_gzip, body_br),
+            )
+            self.db.commit()
+        self.stored += cursor.rowcount
+        return archived_id
+
+    def get(self, archived_id: str) -> Optional[ArchivedDebate]:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT created_at, body, body_gzip, body_br FROM debate_archive WHERE id = ?", (archived_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        bodies = {"identity": row[1], "gzip": row[2]}
+        if row[3] is not None:
+            bodies["br"] = row[3]
+        return ArchivedDebate(archived_id, row[0], bodies)
+
+    def body(self, archived_id: str) -> Optional[Tuple[float, bytes]]:
+        """(created_at, uncompressed body), without reading the compressed copies"""
+        with self.lock:
+            return self.db.execute(
+                "SELECT created_at, body FROM debate_archive WHERE id = ?", (archived_id,)
+            ).fetchone()
+
+    def list(self, limit: int = 20, before: Optional[int] = None) -> Tuple[List[dict], Optional[int]]:
+        """Newest first; returns (entries, cursor for the next page or None)"""
+        query = "SELECT seq, id, topic, intensity, mediator_mode, created_at, size FROM debate_archive"
+        params: list = []
+        if before is not None:
+            # Keyset pagination: each page is one index range scan, however deep
+            query += " WHERE seq < ?"
+            params.append(before)
+        query += " ORDER BY seq DESC LIMIT ?"
+        params.append(limit + 1)
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+        entries = [
+            {"id": row[1], "topic": row[2], "intensity": row[3], "mediator_mode": row[4], "created_at": row[5], "size": row[6]}
+            for row in rows[:limit]
+        ]
+        cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return entries, cursor
+
+    def topics(self, after: int = 0, limit: int = 1000) -> List[Tuple[int, str, str, Optional[str], str]]:
+        """(seq, id, topic, intensity, mediator_mode) in archive order, for indexing a page at a time"""
+        with self.lock:
+            return self.db.execute(
+                "SELECT seq, id, topic, intensity, mediator_mode FROM debate_archive WHERE seq > ? ORDER BY seq LIMIT ?",
+                (after, limit),
+            ).fetchall()
+
+    def stats(self) -> Dict[str, object]:
+        with self.lock:
+            count, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM debate_archive").fetchone()
+        return {
+            "debates": count,
+            "bytes": size,
+            "stored": self.stored,
+            "duplicates": self.duplicates,
+            "brotli": brotli is not None,
+        }
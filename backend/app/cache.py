@@ -0,0 +1,183 @@
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Debate result cache keyed on (endpoint, normalized topic, intensity).
+# Trending topics are requested over and over, and every miss costs three Gemini generations.
+
+
+def normalize_topic(topic: str) -> str:
+    # "Should AI be regulated?" and "  should ai be   regulated " share one entry
+    topic = re.sub(r"\s+", " ", topic.strip().lower())
+    return topic.rstrip("?!. ")
+
+
+def cache_key(endpoint: str, topic: str, intensity: Optional[str] = None) -> str:
+    return f"{endpoint}|{intensity or '-'}|{normalize_topic(topic)}"
+
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL"""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        if time.time() - created_at > self.ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: dict):
+        self.entries[key] = (time.time(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class SQLiteCache:
+    """SQLite-backed LRU cache with a per-entry TTL, so entries survive restarts"""
+
+    # Every read also writes (accessed_at) and commits, so calls are kept off the event loop
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int = 256, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS debate_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS debate_cache_accessed ON debate_cache (accessed_at)")
+        self.db.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT value, created_at FROM debate_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self.db.execute("DELETE FROM debate_cache WHERE key = ?", (key,))
+                self.db.commit()
+                return None
+            self.db.execute("UPDATE debate_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.db.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict):
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO debate_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            # Evict expired entries first, then the least recently used beyond the size bound
+            self.db.execute("DELETE FROM debate_cache WHERE created_at < ?", (now - self.ttl,))
+            self.db.execute(
+                "DELETE FROM debate_cache WHERE key IN ("
+                "SELECT key FROM debate_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.db.commit()
+
+
+class Flight:
+    """One generation in flight and how many requests are waiting on it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class DebateCache:
+    """Wraps a cache backend and coalesces concurrent identical requests (single-flight)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.inflight: Dict[str, Flight] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _backend(self, method: Callable[..., Any], *args) -> Any:
+        if not self.backend.blocking:
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, partial(method, *args))
+
+    async def get(self, key: str) -> Optional[dict]:
+        """A stored value, without generating anything on a miss"""
+        value = await self._backend(self.backend.get, key)
+        if value is not None:
+            self.hits += 1
+        return value
+
+    async def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[dict]],
+        should_store: Callable[[dict], bool] = lambda value: True,
+    ) -> Tuple[dict, bool]:
+        """Return (value, cached); cached is False only for the request that started the factory"""
+        value = await self.get(key)
+        if value is not None:
+            return value, True
+
+        # A burst of identical requests waits on the one generation already in flight.
+        # It runs as its own task, so the request that started it can go away without
+        # cancelling it for the others; it is only cancelled once nobody is waiting.
+        flight = self.inflight.get(key)
+        cached = flight is not None
+        if flight is None:
+            self.misses += 1
+            flight = Flight(asyncio.create_task(self._generate(key, factory, should_store)))
+            self.inflight[key] = flight
+        else:
+            self.hits += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), cached
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+
+    async def _generate(
+        self, key: str, factory: Callable[[], Awaitable[dict]], should_store: Callable[[dict], bool]
+    ) -> dict:
+        try:
+            value = await factory()
+            if should_store(value):
+                await self._backend(self.backend.set, key, value)
+            return value
+        finally:
+            del self.inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "inflight": len(self.inflight)}
+
+
+def create_cache(backend: str, path: str, max_entries: int, ttl: float) -> Optional[DebateCache]:
+    if backend == "off":
+        return None
+    if backend == "sqlite":
+        return DebateCache(SQLiteCache(path, max_entries=max_entries, ttl=ttl))
+    if backend == "memory":
+        return DebateCache(MemoryCache(max_entries=max_entries, ttl=ttl))
+    raise ValueError(f"Unknown DEBATE_CACHE_BACKEND '{backend}' (expected memory, sqlite or off)")
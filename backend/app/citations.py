@@ -0,0 +1,201 @@
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .digest import LINE_PREFIX, SOURCE_PATTERN, SOURCES_HEADING, ArgumentDigest
+
+# Cross-debate memo of the mediator's source verdicts.
+# Debaters cite the same handful of institutions over and over, so instead of asking the mediator
+# to judge the World Bank's credibility from scratch in every debate, its earlier verdict is handed
+# back and only sources it has not assessed yet (or whose verdict has expired) are sent for review.
+
+YEAR = re.compile(r"\b(1[89]|20)\d{2}[a-z]?\b")
+PARENTHETICAL = re.compile(r"\([^)]*\)")
+NON_WORD = re.compile(r"[^a-z0-9]+")
+# Words that describe the kind of document rather than who published it
+GENERIC_WORDS = frozenset("the report reports study studies survey data analysis paper et al journal".split())
+ALIASES = {
+    "international monetary fund": "imf",
+    "world health organization": "who",
+    "world health organisation": "who",
+    "organisation for economic co operation and development": "oecd",
+    "organization for economic cooperation and development": "oecd",
+    "united nations": "un",
+    "european union": "eu",
+    "us bureau of labor statistics": "bls",
+    "bureau of labor statistics": "bls",
+    "intergovernmental panel on climate change": "ipcc",
+}
+
+# "| World Bank | High | Publishes audited statistical series |" under a "Source Verdicts" heading
+VERDICTS_HEADING = re.compile(r"^[#*\s]*source verdicts[\s:*]*$", re.IGNORECASE)
+CREDIBILITY_LEVELS = ("high", "medium", "low")
+
+
+def normalize_source(source: str) -> str:
+    """Memo key for a cited source: who published it, without years, document types or punctuation"""
+    key = PARENTHETICAL.sub(" ", source.lower())
+    key = YEAR.sub(" ", key)
+    key = " ".join(word for word in NON_WORD.sub(" ", key).split() if word not in GENERIC_WORDS)
+    return ALIASES.get(key, key)
+
+
+def source_keys(source: str) -> List[str]:
+    # "[Source: IMF; World Bank]" cites two sources
+    return [key for key in map(normalize_source, source.split(";")) if key]
+
+
+def extract_citations(*digests: ArgumentDigest) -> Dict[str, str]:
+    """Normalized key -> source as first cited, over every [Source: ...] and sources list in the arguments"""
+    citations: Dict[str, str] = {}
+    for digest in digests:
+        for source in digest.sources:
+            for part in source.split(";"):
+                key = normalize_source(part)
+                if key and key not in citations:
+                    citations[key] = part.strip()
+    return citations
+
+
+def label_for(source: str, labels: Dict[str, str]) -> Optional[str]:
+    """The labels of a citation ("S1; S3"), or None unless every source in it has one"""
+    keys = source_keys(source)
+    if keys and all(key in labels for key in keys):
+        return "; ".join(labels[key] for key in dict.fromkeys(keys))
+    return None
+
+
+def cite_by_label(argument: str, labels: Dict[str, str]) -> str:
+    """Cite labelled sources by label ("[S1]") and drop them from the closing sources list"""
+
+    def relabel(match: "re.Match") -> str:
+        label = label_for(match.group(1), labels)
+        return f"[{label}]" if label else match.group(0)
+
+    lines = []
+    in_sources = False
+    for line in argument.splitlines():
+        if SOURCES_HEADING.match(line):
+            in_sources = True
+        elif in_sources:
+            listed = LINE_PREFIX.sub("", SOURCE_PATTERN.sub(r"\1", line)).strip(" *_\"'")
+            if listed and label_for(listed, labels):
+                continue
+        lines.append(SOURCE_PATTERN.sub(relabel, line))
+    return "\n".join(lines)
+
+
+class Verdict(NamedTuple):
+    source: str
+    credibility: str  # High, Medium, Low or Unrated
+    reason: str
+    verified_at: float
+
+
+def parse_verdicts(analysis: str) -> Dict[str, Verdict]:
+    """Read the mediator's "Source Verdicts" table back into verdicts keyed by normalized source"""
+    verdicts: Dict[str, Verdict] = {}
+    in_table = False
+    now = time.time()
+    for line in analysis.splitlines():
+        if VERDICTS_HEADING.match(line):
+            in_table = True
+            continue
+        if not in_table:
+            continue
+        if not line.strip().startswith("|"):
+            if verdicts or line.strip().startswith("#"):
+                break  # the table has ended
+            continue
+        cells = [cell.strip().strip("*_ ") for cell in line.strip().strip("|").split("|")]
+        if len(cells) < 2 or cells[0].lower() == "source" or set(cells[0]) <= set("-: "):
+            continue
+        # "Medium-High" counts as the first level named
+        named = [(cells[1].lower().find(level), level) for level in CREDIBILITY_LEVELS if level in cells[1].lower()]
+        credibility = min(named)[1].title() if named else "Unrated"
+        reason = cells[2] if len(cells) > 2 else ""
+        key = normalize_source(cells[0])
+        if key:
+            verdicts[key] = Verdict(cells[0], credibility, reason, now)
+    return verdicts
+
+
+class CitationMemo:
+    """SQLite memo of source verdicts; entries older than max_age are verified again"""
+
+    def __init__(self, path: str, max_age: float = 30 * 86400):
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS source_verdicts ("
+            "key TEXT PRIMARY KEY, source TEXT NOT NULL, credibility TEXT NOT NULL, reason TEXT NOT NULL, "
+            "verified_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.db.commit()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def lookup(self, keys: Iterable[str]) -> Tuple[Dict[str, Verdict], Dict[str, str]]:
+        """Split keys into (known verdicts, key -> "miss" or "expired" for the ones to verify)"""
+        keys = list(keys)
+        if not keys:
+            return {}, {}
+        now = time.time()
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT key, source, credibility, reason, verified_at FROM source_verdicts "
+                f"WHERE key IN ({', '.join('?' * len(keys))})",
+                keys,
+            ).fetchall()
+            found = {row[0]: Verdict(*row[1:]) for row in rows}
+            known = {key: verdict for key, verdict in found.items() if now - verdict.verified_at <= self.max_age}
+            if known:
+                self.db.executemany("UPDATE source_verdicts SET hits = hits + 1 WHERE key = ?", [(k,) for k in known])
+                self.db.commit()
+        unseen = {key: "expired" if key in found else "miss" for key in keys if key not in known}
+        self.hits += len(known)
+        self.misses += sum(1 for reason in unseen.values() if reason == "miss")
+        self.expired += sum(1 for reason in unseen.values() if reason == "expired")
+        return known, unseen
+
+    def record(self, verdicts: Dict[str, Verdict]):
+        if not verdicts:
+            return
+        with self.lock:
+            self.db.executemany(
+                "INSERT INTO source_verdicts (key, source, credibility, reason, verified_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET source = excluded.source, credibility = excluded.credibility, "
+                "reason = excluded.reason, verified_at = excluded.verified_at",
+                [(key, *verdict) for key, verdict in verdicts.items()],
+            )
+            # Expired verdicts that were never re-verified only take up space
+            self.db.execute("DELETE FROM source_verdicts WHERE verified_at < ?", (time.time() - 2 * self.max_age,))
+            self.db.commit()
+
+    def stats(self) -> Dict[str, object]:
+        with self.lock:
+            entries = self.db.execute("SELECT COUNT(*) FROM source_verdicts").fetchone()[0]
+        lookups = self.hits + self.misses + self.expired
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "max_age": self.max_age,
+        }
+
+
+def source_labels(known: Dict[str, Verdict]) -> Dict[str, str]:
+    """Short labels ("S1", "S2", ...) a mediator prompt cites already rated sources by"""
+    return {key: f"S{i}" for i, key in enumerate(known, 1)}
+
+
+def render_verdicts(known: Dict[str, Verdict], labels: Dict[str, str]) -> str:
+    # Just the rating: the reasons were given when each source was verified, and repeating them would
+    # cost more prompt than verifying the source again saves
+    return "\n".join(f"- [{labels[key]}] {verdict.source}: {verdict.credibility}" for key, verdict in known.items())
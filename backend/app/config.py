@@ -0,0 +1,94 @@
+import os
+from typing import List, Mapping, Optional, Sequence
+
+# Environment configuration, read once at startup. Problems are collected rather than raised one
+# at a time, so a misconfigured deploy fails with a single message naming every bad variable
+# instead of a traceback from whichever os.getenv() happened to run first.
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off", "")
+
+
+class ConfigError(ValueError):
+    def __init__(self, problems: List[str]):
+        super().__init__("Invalid configuration:\n" + "\n".join(f"  - {problem}" for problem in problems))
+        self.problems = problems
+
+
+class Env:
+    """Typed accessors over the environment; bad values fall back to the default and are reported by check()"""
+
+    def __init__(self, environ: Optional[Mapping[str, str]] = None):
+        self.environ = os.environ if environ is None else environ
+        self.problems: List[str] = []
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.environ.get(name)
+        return default if value is None else value.strip()
+
+    def require(self, name: str, description: str) -> str:
+        value = self.get(name)
+        if not value:
+            self.problems.append(f"{name} is required ({description}); set it in the environment or backend/.env")
+            return ""
+        return value
+
+    def get_int(self, name: str, default: int, minimum: Optional[int] = None) -> int:
+        value = self.get(name)
+        if not value:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            self.problems.append(f"{name} must be an integer, got {value!r}")
+            return default
+        if minimum is not None and number < minimum:
+            self.problems.append(f"{name} must be at least {minimum}, got {number}")
+            return default
+        return number
+
+    def get_float(
+        self, name: str, default: float, minimum: Optional[float] = None, maximum: Optional[float] = None
+    ) -> float:
+        value = self.get(name)
+        if not value:
+            return default
+        try:
+            number = float(value)
+        except ValueError:
+            self.problems.append(f"{name} must be a number, got {value!r}")
+            return default
+        if minimum is not None and number < minimum:
+            self.problems.append(f"{name} must be at least {minimum:g}, got {number:g}")
+            return default
+        if maximum is not None and number > maximum:
+            self.problems.append(f"{name} must be at most {maximum:g}, got {number:g}")
+            return default
+        return number
+
+    def get_bool(self, name: str, default: bool = False) -> bool:
+        value = self.get(name)
+        if value is None:
+            return default
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        self.problems.append(f"{name} must be true or false, got {value!r}")
+        return default
+
+    def get_choice(self, name: str, default: str, choices: Sequence[str]) -> str:
+        value = self.get(name) or default
+        if value not in choices:
+            self.problems.append(f"{name} must be one of {', '.join(choices)}, got {value!r}")
+            return default
+        return value
+
+    def get_list(self, name: str, default: Sequence[str]) -> List[str]:
+        value = self.get(name)
+        items = [item.strip() for item in value.split(",") if item.strip()] if value else []
+        return items or list(default)
+
+    def check(self):
+        if self.problems:
+            raise ConfigError(self.problems)
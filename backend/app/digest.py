@@ -0,0 +1,129 @@
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Compact structured digests of finished arguments for the mediator.
+# Instead of re-sending both ~300 word arguments, the mediator can be handed the thesis,
+# the key claims and the [Source: ...] citations behind each, which is all it fact-checks.
+
+SOURCE_PATTERN = re.compile(r"\[\s*Sources?\s*:\s*([^\]]+)\]", re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+# "Sources Referenced:", "## Sources", "**Sources Cited:**" and the like
+SOURCES_HEADING = re.compile(r"^[#*_\s]*(sources?|references|citations)(\s+(referenced|cited|used))?[\s:*_]*$", re.IGNORECASE)
+LINE_PREFIX = re.compile(r"^\s*(#+|[-*•]|\d+[.)])\s*")
+HEADING = re.compile(r"^\s*(#+\s.*|\*\*[^*]+\*\*:?|__[^_]+__:?)\s*$")
+HAS_FIGURE = re.compile(r"\d")
+
+MAX_CLAIMS = 6
+MAX_CLAIM_CHARS = 220
+
+
+class Claim(NamedTuple):
+    text: str
+    sources: Tuple[str, ...]
+
+
+class ArgumentDigest(NamedTuple):
+    thesis: Claim
+    claims: List[Claim]
+    sources: List[str]
+
+
+def _clean(text: str) -> str:
+    text = LINE_PREFIX.sub("", text)
+    text = re.sub(r"[*_`]+", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _normalize_source(source: str) -> str:
+    return re.sub(r"\s+", " ", source.strip().strip("\"'“”")).rstrip(".")
+
+
+def _shorten(text: str, limit: int = MAX_CLAIM_CHARS) -> str:
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def digest_argument(text: str, max_claims: int = MAX_CLAIMS) -> ArgumentDigest:
+    """Extract the thesis, the strongest claims with their citations, and every cited source"""
+    body_lines: List[str] = []
+    listed_sources: List[str] = []
+    in_sources = False
+    for line in text.splitlines():
+        if SOURCES_HEADING.match(line):
+            in_sources = True
+            continue
+        if in_sources:
+            # The closing "Sources Referenced:" list, one source per line
+            cleaned = _clean(SOURCE_PATTERN.sub(r"\1", line))
+            if cleaned:
+                listed_sources.append(_normalize_source(cleaned))
+            continue
+        body_lines.append(line)
+
+    sentences: List[Claim] = []
+    for line in body_lines:
+        if HEADING.match(line):
+            continue
+        # Park citations behind placeholders so "Dr. Smith" inside one doesn't split a sentence
+        citations: List[str] = []
+
+        def park(match: "re.Match") -> str:
+            citations.append(_normalize_source(match.group(1)))
+            return f"\x00{len(citations) - 1}\x00"
+
+        paragraph = _clean(SOURCE_PATTERN.sub(park, line))
+        for sentence in SENTENCE_SPLIT.split(paragraph):
+            sources = tuple(citations[int(i)] for i in re.findall(r"\x00(\d+)\x00", sentence))
+            claim = re.sub(r"\s+([.,;:!?])", r"\1", re.sub(r"\x00\d+\x00", "", sentence)).strip()
+            if not any(c.isalnum() for c in claim):
+                # A citation that landed after the full stop belongs to the previous sentence
+                if sources and sentences:
+                    sentences[-1] = Claim(sentences[-1].text, sentences[-1].sources + sources)
+                continue
+            sentences.append(Claim(_shorten(claim), sources))
+
+    # Repeated sentences are folded together with all of their citations
+    merged: Dict[str, Tuple[str, ...]] = {}
+    for claim in sentences:
+        known = merged.get(claim.text, ())
+        merged[claim.text] = known + tuple(s for s in claim.sources if s not in known)
+    unique = [Claim(text, sources) for text, sources in merged.items()]
+
+    thesis = next((claim for claim in unique if len(claim.text.split()) >= 5), Claim("", ()))
+    # Cited claims first, then ones carrying figures, then the rest; kept in argument order
+    ranked = sorted(
+        (i for i, claim in enumerate(unique) if claim is not thesis),
+        key=lambda i: (not unique[i].sources, not HAS_FIGURE.search(unique[i].text), i),
+    )
+    claims = [unique[i] for i in sorted(ranked[:max_claims])]
+
+    sources: List[str] = []
+    for source in [s for claim in sentences for s in claim.sources] + listed_sources:
+        if source and source.lower() not in (seen.lower() for seen in sources):
+            sources.append(source)
+    return ArgumentDigest(thesis, claims, sources)
+
+
+Labeler = Callable[[str], Optional[str]]
+
+
+def _render_claim(claim: Claim, label: Labeler) -> str:
+    cited = "; ".join(label(source) or source for source in claim.sources) if claim.sources else "UNSOURCED"
+    return f"{claim.text} [cited: {cited}]"
+
+
+def render_digest(digest: ArgumentDigest, label: Optional[Labeler] = None) -> str:
+    """Render a digest; sources `label` gives a short label are cited by it and left off the sources list"""
+    label = label or (lambda source: None)
+    thesis = _render_claim(digest.thesis, label) if digest.thesis.text else "(none stated)"
+    lines = [f"Thesis: {thesis}", "Key claims:"]
+    for i, claim in enumerate(digest.claims, 1):
+        lines.append(f"{i}. {_render_claim(claim, label)}")
+    if not digest.claims:
+        lines.append("(no claims extracted)")
+    sources = [source for source in digest.sources if not label(source)]
+    if len(sources) < len(digest.sources):
+        sources.append("labelled sources, rated below")
+    lines.append("Sources: " + ("; ".join(sources) if sources else "none"))
+    return "\n".join(lines)
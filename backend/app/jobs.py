@@ -0,0 +1,211 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Background debate jobs for runs that outlive proxy/HTTP timeouts (e.g. "extreme" intensity).
+# Jobs live in SQLite, so they survive a worker restart and can be processed either by
+# in-process workers or by a separate `python -m app.worker` process sharing the same file.
+
+# Where each agent's partial result is stored as it lands
+PARTIAL_COLUMNS = {"pro": "pro_argument", "con": "con_argument", "mediator": "mediator_analysis"}
+
+JobRunner = Callable[[dict, Callable[[str, str], None]], Awaitable[dict]]
+
+
+class JobStore:
+    def __init__(self, path: str, lease_seconds: float = 900, max_attempts: int = 3):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # Autocommit mode, so claims can take an explicit write lock across processes
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS debate_jobs ("
+            "id TEXT PRIMARY KEY, topic TEXT NOT NULL, intensity TEXT, status TEXT NOT NULL, "
+            "pro_argument TEXT, con_argument TEXT, mediator_analysis TEXT, result TEXT, error TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, lease_until REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS debate_jobs_status ON debate_jobs (status, created_at)")
+
+    def create(self, topic: str, intensity: Optional[str]) -> dict:
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO debate_jobs (id, topic, intensity, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, topic, intensity, now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self.lock:
+            row = self.db.execute("SELECT * FROM debate_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim(self) -> Optional[dict]:
+        """Take the oldest queued job, or a running one whose worker stopped renewing its lease"""
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                # A job whose workers keep dying mid-run (e.g. it runs them out of memory) is given up on
+                # rather than taking down every worker that claims it
+                self.db.execute(
+                    "UPDATE debate_jobs SET status = 'failed', error = ?, lease_until = NULL, updated_at = ? "
+                    "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                    (f"Abandoned after {self.max_attempts} attempts", now, now, self.max_attempts),
+                )
+                row = self.db.execute(
+                    "SELECT id FROM debate_jobs WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    self.db.execute("COMMIT")
+                    return None
+                self.db.execute(
+                    "UPDATE debate_jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (now + self.lease_seconds, now, row["id"]),
+                )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def save_partial(self, job_id: str, role: str, text: str):
+        column = PARTIAL_COLUMNS[role]
+        now = time.time()
+        # Landing a partial result also renews the lease
+        with self.lock:
+            self.db.execute(
+                f"UPDATE debate_jobs SET {column} = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                (text, now + self.lease_seconds, now, job_id),
+            )
+
+    def complete(self, job_id: str, result: dict):
+        with self.lock:
+            self.db.execute(
+                "UPDATE debate_jobs SET status = 'completed', result = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str):
+        with self.lock:
+            self.db.execute(
+                "UPDATE debate_jobs SET status = 'failed', error = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                (error, time.time(), job_id),
+            )
+
+    def requeue(self, job_ids: List[str]):
+        # Hand interrupted jobs back on shutdown; partial results are kept and reused
+        with self.lock:
+            self.db.executemany(
+                "UPDATE debate_jobs SET status = 'queued', lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                [(time.time(), job_id) for job_id in job_ids],
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.db.execute("SELECT status, COUNT(*) AS n FROM debate_jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job.pop("lease_until")
+        return job
+
+
+class JobQueue:
+    """Runs jobs from a JobStore on a fixed number of worker tasks"""
+
+    def __init__(self, store: JobStore, runner: JobRunner, workers: int = 1, poll_interval: float = 2.0):
+        self.store = store
+        self.runner = runner
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.wakeup: Optional[asyncio.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.tasks: List[asyncio.Task] = []
+        self.running: Dict[str, asyncio.Task] = {}
+
+    def submit(self, topic: str, intensity: Optional[str]) -> dict:
+        """Queue a job; safe to call from any thread (sync endpoints run on the threadpool)"""
+        job = self.store.create(topic, intensity)
+        if self.wakeup is not None:
+            # asyncio.Event is not thread-safe, so the wake-up is handed to the loop
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+        return job
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+        self.tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        interrupted = list(self.running)
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self._store(self.store.requeue, interrupted)
+        self.tasks = []
+
+    async def run_forever(self):
+        """Entry point for a dedicated worker process"""
+        await self.start()
+        try:
+            await asyncio.gather(*self.tasks)
+        finally:
+            await self.stop()
+
+    async def _store(self, method: Callable[..., Any], *args) -> Any:
+        # Store calls can wait up to the SQLite timeout for another process's write lock,
+        # so they run on the default executor rather than stalling the event loop
+        return await asyncio.get_running_loop().run_in_executor(None, partial(method, *args))
+
+    async def _work(self):
+        while True:
+            job = await self._store(self.store.claim)
+            if job is None:
+                # Woken early by an in-process submit; otherwise poll for jobs from other processes
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self.wakeup.clear()
+                continue
+            self.running[job["id"]] = asyncio.current_task()
+            try:
+                await self._run(job)
+            finally:
+                self.running.pop(job["id"], None)
+
+    async def _run(self, job: dict):
+        saves: List[asyncio.Future] = []
+
+        def on_progress(role: str, text: str):
+            saves.append(asyncio.ensure_future(self._store(self.store.save_partial, job["id"], role, text)))
+
+        try:
+            result = await self.runner(job, on_progress)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Let partial results land first, so none of them renews the lease of a finished job
+            await asyncio.gather(*saves, return_exceptions=True)
+            await self._store(self.store.fail, job["id"], str(e))
+        else:
+            await asyncio.gather(*saves, return_exceptions=True)
+            await self._store(self.store.complete, job["id"], result)
+
@@ -1,201 +1,492 @@
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
-import os
-import google.generativeai as genai
 import asyncio
 import json
-from typing import Dict, List
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .archive import DebateArchive, choose_encoding, etag_matches
+from .cache import cache_key, create_cache
+from .citations import (
+    CitationMemo, cite_by_label, extract_citations, label_for, parse_verdicts, render_verdicts, source_labels
+)
+from .config import Env
+from .digest import ArgumentDigest, digest_argument, render_digest
+from .jobs import PARTIAL_COLUMNS, JobQueue, JobStore
+from .metrics import MetricsRegistry, record_timing, request_timings, server_timing_header, timed
+from .prompts import PromptRegistry, RenderedPrompt, TokenUsage
+from .resilience import AgentError, CircuitOpenError, ResiliencePolicy, call_with_resilience, is_retryable
+from .routing import DEFAULT_MODEL, ModelRouter, RouteConfig, Served, parse_models
+from .rounds import MultiRoundDebate, RoundResult, TurnError
+from .sanitizer import StreamSanitizer, sanitize
+from .similarity import TopicIndex
 
 # Load environment variables
 load_dotenv()
 
-# Initialize FastAPI app
-app = FastAPI(title="Vox Dualis - Ethical Debate Arena", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+# All configuration is read and validated here, once; every problem is reported together at startup
+env = Env()
 
 # Get frontend URLs from environment (for flexible deployment)
-FRONTEND_URLS = os.getenv("FRONTEND_URLS").split(",")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=FRONTEND_URLS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+FRONTEND_URLS = env.get_list("FRONTEND_URLS", ["http://localhost:3000"])
 
 # Get API keys from environment
-GEMINI_API_KEY_1 = os.getenv("GEMINI_API_KEY_1")  # Pro debater
-GEMINI_API_KEY_2 = os.getenv("GEMINI_API_KEY_2")  # Con debater  
-GEMINI_API_KEY_3 = os.getenv("GEMINI_API_KEY_3")  # Mediator/Fact-checker
+GEMINI_API_KEY_1 = env.require("GEMINI_API_KEY_1", "Gemini key for the pro debater")
+GEMINI_API_KEY_2 = env.require("GEMINI_API_KEY_2", "Gemini key for the con debater")
+GEMINI_API_KEY_3 = env.require("GEMINI_API_KEY_3", "Gemini key for the mediator")
+
+# Agents (and the Gemini SDK) are loaded on first use; AGENT_WARMUP does it in the background at startup
+AGENT_WARMUP = env.get_bool("AGENT_WARMUP", False)
+
+# The Gemini SDK call is blocking, so agent generations run on a bounded thread pool.
+# This keeps the event loop free (pro and con overlap, /health stays responsive) and
+# caps how many upstream calls a single worker can have in flight at once.
+AGENT_MAX_CONCURRENCY = env.get_int("AGENT_MAX_CONCURRENCY", 8, minimum=1)
+
+# Deadlines, retries and per-key rate limits for every Gemini call
+resilience_policy = ResiliencePolicy(
+    timeout=env.get_float("AGENT_TIMEOUT", 60, minimum=1),
+    max_retries=env.get_int("AGENT_MAX_RETRIES", 3, minimum=0),
+    backoff_base=env.get_float("AGENT_BACKOFF_BASE", 1.0, minimum=0),
+    backoff_max=env.get_float("AGENT_BACKOFF_MAX", 20, minimum=0),
+    rate_per_minute=env.get_float("AGENT_RATE_LIMIT_RPM", 15, minimum=0),
+    failure_threshold=env.get_int("AGENT_BREAKER_THRESHOLD", 5, minimum=1),
+    reset_timeout=env.get_float("AGENT_BREAKER_RESET", 30, minimum=0),
+)
+
+# Model routing per role: <ROLE>_MODELS (falling back to AGENT_MODELS) lists the primary model, then
+# fallbacks. With a hedge percentile set, a call slower than that percentile of recent latencies is
+# raced against the next model in the route.
+AGENT_NAMES = ("pro", "con", "mediator")
+AGENT_MODELS = env.get("AGENT_MODELS", DEFAULT_MODEL)
+AGENT_HEDGE_PERCENTILE = env.get_float("AGENT_HEDGE_PERCENTILE", 0, minimum=0)
+AGENT_HEDGE_MIN_DELAY = env.get_float("AGENT_HEDGE_MIN_DELAY", 2, minimum=0)
+
+def route_for(name: str) -> RouteConfig:
+    prefix = name.upper()
+    return RouteConfig(
+        models=parse_models(env.get(f"{prefix}_MODELS", AGENT_MODELS)),
+        hedge_percentile=env.get_float(f"{prefix}_HEDGE_PERCENTILE", AGENT_HEDGE_PERCENTILE, minimum=0),
+        hedge_min_delay=env.get_float(f"{prefix}_HEDGE_MIN_DELAY", AGENT_HEDGE_MIN_DELAY, minimum=0),
+    )
+
+agent_routes = {name: route_for(name) for name in AGENT_NAMES}
+
+# Optional Server-Timing header with per-phase durations on every response
+SERVER_TIMING = env.get_bool("SERVER_TIMING", False)
+
+# PROMPT_TEMPLATE_DIR can override any of app/templates/*.txt
+PROMPT_TEMPLATE_DIR = env.get("PROMPT_TEMPLATE_DIR")
+
+# The mediator judges either the "full" arguments or a compact "digest" of their claims and sources
+MEDIATOR_MODES = ("full", "digest")
+MEDIATOR_MODE = env.get_choice("MEDIATOR_MODE", "full", MEDIATOR_MODES)
 
-# Validate API keys
-if not all([GEMINI_API_KEY_1, GEMINI_API_KEY_2, GEMINI_API_KEY_3]):
-    raise ValueError("Missing required API keys. Please check your .env file.")
+# Multi-round debates: opening, DEBATE_ROUNDS - 2 rebuttals, conclusion
+DEBATE_ROUNDS = env.get_int("DEBATE_ROUNDS", 3, minimum=1)
+DEBATE_MAX_ROUNDS = env.get_int("DEBATE_MAX_ROUNDS", 5, minimum=1)
 
-# Configure models for each agent
-genai.configure(api_key=GEMINI_API_KEY_1)
-pro_model = genai.GenerativeModel("gemini-2.5-flash")
+# Batch generation: at most BATCH_MAX_CONCURRENCY debates in flight across all batch requests.
+# Per-key rate limits still apply underneath through each agent's token bucket.
+BATCH_MAX_CONCURRENCY = env.get_int("BATCH_MAX_CONCURRENCY", 4, minimum=1)
+BATCH_MAX_ITEMS = env.get_int("BATCH_MAX_ITEMS", 100, minimum=1)
+
+# Cache finished debates per (endpoint, normalized topic, intensity); backend is memory, sqlite or off
+DEBATE_CACHE_BACKEND = env.get_choice("DEBATE_CACHE_BACKEND", "memory", ("memory", "sqlite", "off"))
+DEBATE_CACHE_PATH = env.get("DEBATE_CACHE_PATH", "debate_cache.sqlite3")
+DEBATE_CACHE_MAX_ENTRIES = env.get_int("DEBATE_CACHE_MAX_ENTRIES", 256, minimum=1)
+DEBATE_CACHE_TTL = env.get_float("DEBATE_CACHE_TTL", 3600, minimum=0)
+
+# Background jobs for long debates, stored in SQLite so they survive restarts
+DEBATE_JOBS_PATH = env.get("DEBATE_JOBS_PATH", "debate_jobs.sqlite3")
+DEBATE_JOBS_LEASE = env.get_float("DEBATE_JOBS_LEASE", 900, minimum=1)
+DEBATE_JOBS_MAX_ATTEMPTS = env.get_int("DEBATE_JOBS_MAX_ATTEMPTS", 3, minimum=1)
+DEBATE_JOB_WORKERS = env.get_int("DEBATE_JOB_WORKERS", 1, minimum=0)
+DEBATE_JOBS_POLL_INTERVAL = env.get_float("DEBATE_JOBS_POLL_INTERVAL", 2, minimum=0.1)
+
+# Finished debates are archived under content-addressed ids for GET /debate/{id}; an empty path disables it
+DEBATE_ARCHIVE_PATH = env.get("DEBATE_ARCHIVE_PATH", "debate_archive.sqlite3")
+DEBATE_ARCHIVE_PAGE_SIZE = env.get_int("DEBATE_ARCHIVE_PAGE_SIZE", 100, minimum=1)
+
+# The mediator's source verdicts are remembered across debates; an empty path disables the memo
+CITATION_MEMO_PATH = env.get("CITATION_MEMO_PATH", "citation_memo.sqlite3")
+CITATION_MEMO_MAX_AGE = env.get_float("CITATION_MEMO_MAX_AGE", 30 * 86400, minimum=0)
+
+# Serve the archived debate of a near-identical earlier topic instead of generating a new one. Off by
+# default: requests can opt in with reuse_similar, and GET /topics/similar offers matches either way.
+TOPIC_REUSE = env.get_bool("TOPIC_REUSE", False)
+TOPIC_SIMILARITY_THRESHOLD = env.get_float("TOPIC_SIMILARITY_THRESHOLD", 0.8, minimum=0.1, maximum=1)
+# Archived debates older than this are not reused, just as cached ones expire after DEBATE_CACHE_TTL
+TOPIC_REUSE_MAX_AGE = env.get_float("TOPIC_REUSE_MAX_AGE", DEBATE_CACHE_TTL, minimum=0)
+
+env.check()
+
+agent_executor = ThreadPoolExecutor(max_workers=AGENT_MAX_CONCURRENCY, thread_name_prefix="debate-agent")
+
+# Prometheus metrics served on /metrics
+metrics = MetricsRegistry()
+agent_call_seconds = metrics.histogram(
+    "vox_agent_call_seconds", "Gemini call latency per agent, including retries", ["agent", "outcome"]
+)
+debate_phase_seconds = metrics.histogram("vox_debate_phase_seconds", "Duration of each debate phase", ["phase"])
+agent_tokens = metrics.counter("vox_agent_tokens_total", "Tokens reported in Gemini usage metadata", ["agent", "kind"])
+prompt_estimated_tokens = metrics.counter(
+    "vox_prompt_estimated_tokens_total", "Estimated prompt tokens sent per agent", ["agent"]
+)
+agent_errors = metrics.counter("vox_agent_errors_total", "Failed agent generations by error type", ["agent", "type"])
+agent_served = metrics.counter(
+    "vox_agent_served_total", "Generations per agent by the model that served them", ["agent", "model", "route"]
+)
+cache_requests = metrics.counter("vox_debate_cache_requests_total", "Debate cache lookups by result", ["result"])
+topic_lookups = metrics.counter(
+    "vox_topic_index_lookups_total", "Similar-topic lookups before generating a debate, by result", ["result"]
+)
+topic_lookup_seconds = metrics.histogram(
+    "vox_topic_index_lookup_seconds",
+    "Similar-topic index lookup latency",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+citation_lookups = metrics.counter(
+    "vox_citation_memo_lookups_total", "Cited sources looked up in the verdict memo, by result", ["result"]
+)
+archive_requests = metrics.counter(
+    "vox_debate_archive_requests_total", "Archived debate views by result (ok, not_modified, not_found)", ["result"]
+)
+mediator_prompt_size = metrics.histogram(
+    "vox_mediator_prompt_tokens",
+    "Estimated mediator prompt tokens per debate, rendered in both modes for comparison",
+    ["mode"],
+    buckets=(250, 500, 1000, 1500, 2000, 3000, 5000),
+)
+debate_round_seconds = metrics.histogram(
+    "vox_debate_round_seconds", "Duration of each round of a multi-round debate", ["stage"]
+)
+debate_round_prompt_tokens = metrics.histogram(
+    "vox_debate_round_prompt_tokens",
+    "Prompt tokens per round of a multi-round debate, both sides (as reported by the model, else estimated)",
+    ["stage"],
+    buckets=(500, 1000, 1500, 2000, 3000, 5000, 8000),
+)
+
+# Prompt templates are compiled once at startup
+prompt_registry = PromptRegistry(PROMPT_TEMPLATE_DIR)
+
+batch_semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+debate_cache = create_cache(
+    backend=DEBATE_CACHE_BACKEND,
+    path=DEBATE_CACHE_PATH,
+    max_entries=DEBATE_CACHE_MAX_ENTRIES,
+    ttl=DEBATE_CACHE_TTL,
+)
+
+debate_archive = DebateArchive(DEBATE_ARCHIVE_PATH) if DEBATE_ARCHIVE_PATH else None
+
+citation_memo = CitationMemo(CITATION_MEMO_PATH, max_age=CITATION_MEMO_MAX_AGE) if CITATION_MEMO_PATH else None
+
+# Filled from the archive in the background at startup, then as debates are archived
+topic_index = TopicIndex(TOPIC_SIMILARITY_THRESHOLD) if debate_archive is not None else None
 
 class DebateAgent:
-    def __init__(self, api_key: str, role: str, personality: str, argument_style: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-1.5-flash")
+    def __init__(
+        self,
+        api_key: str,
+        role: str,
+        personality: str,
+        argument_style: str,
+        name: str = "agent",
+        route: Optional[RouteConfig] = None,
+    ):
+        # The SDK takes about a second to import, so it is loaded with the first agent, not the app
+        import google.ai.generativelanguage as glm
+
+        # genai.configure() is process-global, so the last agent's key used to win for every agent.
+        # Each agent instead gets its own client (and gRPC channel) bound to its own key.
+        self.client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+        self.name = name
+        self.router = ModelRouter(
+            route or RouteConfig((DEFAULT_MODEL,)), self.make_model, timeout=resilience_policy.timeout
+        )
         self.role = role
         self.personality = personality
         self.argument_style = argument_style
+        # The persona and strategy are static, so splice them into the agent template once
+        self.template = prompt_registry.bind(
+            "agent", name, role=role, personality=personality, argument_style=argument_style
+        )
+        # Per-key usage, so we can confirm load really spreads across the keys
+        self.key_id = f"...{api_key[-4:]}"
+        self.request_count = 0
+        self.error_count = 0
+        # One token bucket and circuit breaker per API key
+        self.limiter = resilience_policy.make_limiter()
+        self.breaker = resilience_policy.make_breaker()
     
-    async def generate_argument(self, topic: str, context: str = "") -> str:
-        try:
-            prompt = f"""
-            You are {self.role} - a world-renowned expert debater and public intellectual.
-            {self.personality}
-            
-            DEBATE TOPIC: {topic}
-            
-            {self.argument_style}
-            
-            CRITICAL REQUIREMENTS:
-            1. Use SPECIFIC, VERIFIABLE facts, statistics, or historical examples
-            2. Include at least 2-3 concrete pieces of evidence
-            3. Address real-world implications and consequences
-            4. Use powerful, persuasive language that moves the audience
-            5. Anticipate and preemptively counter obvious objections
-            6. Make your argument so compelling that fence-sitters will be swayed
-            7. Structure: Hook → Evidence → Logic → Emotional Appeal → Call to Action
-            8. **MANDATORY: Cite specific sources for your claims using this format:**
-               - [Source: Organization/Study Name, Year] for statistics
-               - [Source: "Quote from Expert Name, Title, Institution"] for expert opinions
-               - [Source: Historical Event/Case Study Name] for examples
-               - [Source: Research Paper/Report Title] for studies
-            
-            {f"PREVIOUS DEBATE CONTEXT TO BUILD UPON: {context}" if context else ""}
-            
-            Your argument must be 250-300 words of pure persuasive power with CREDIBLE SOURCES.
-            Every major claim must have a source citation. Make every sentence count.
-            Begin with a powerful opening statement that immediately grabs attention.
-            End with a "Sources Referenced:" section listing your citations.
-            
-            FORMATTING: Use markdown formatting only. For line breaks, use double spaces followed by a newline.
-            DO NOT use HTML tags like <br>, <b>, or <i>. Use markdown syntax instead.
-            """
-            
-            response = self.model.generate_content(prompt)
-            # Clean up any HTML tags that might be generated
-            clean_text = response.text
-            clean_text = clean_text.replace('<br>', '\n')
-            clean_text = clean_text.replace('<br/>', '\n')
-            clean_text = clean_text.replace('<br />', '\n')
-            clean_text = clean_text.replace('<b>', '**')
-            clean_text = clean_text.replace('</b>', '**')
-            clean_text = clean_text.replace('<i>', '_')
-            clean_text = clean_text.replace('</i>', '_')
-            clean_text = clean_text.replace('<strong>', '**')
-            clean_text = clean_text.replace('</strong>', '**')
-            clean_text = clean_text.replace('<em>', '_')
-            clean_text = clean_text.replace('</em>', '_')
-            return clean_text
-        except Exception as e:
-            return f"Error generating argument: {str(e)}"
-
-# Initialize the three debate agents with enhanced personalities and argument styles
-pro_agent = DebateAgent(
-    GEMINI_API_KEY_1, 
-    "Marcus Advocatus - The Visionary Champion",
-    """You are one of the world's most persuasive advocates and thought leaders. You see the transformative potential in every idea.
-    You have access to cutting-edge research, success stories, and visionary insights from global institutions.
-    You speak with the passion of someone who has witnessed positive change firsthand and understands how progress happens.""",
-    """
-    ARGUMENT STRATEGY FOR PRO POSITION:
-    - Lead with shocking statistics or breakthrough examples that prove your point
-    - Cite specific case studies, research papers, or real-world success stories WITH SOURCES
-    - Paint a vivid picture of the positive future this stance creates
-    - Use urgency: "We cannot afford to wait" or "History will judge us"
-    - Address the cost of inaction with concrete examples and citations
-    - End with an inspiring vision that makes opposing seem foolish
-    
-    EVIDENCE TYPES TO USE (WITH MANDATORY CITATIONS):
-    - Economic data and ROI figures [Source: World Bank, IMF, Government Reports]
-    - Scientific studies and peer-reviewed research [Source: Nature, Science, specific journals]
-    - Historical precedents and success stories [Source: Historical events, case studies]
-    - Expert testimonials and quotes [Source: "Expert Name, Title, Institution"]
-    - Technological breakthroughs and innovations [Source: Company reports, tech studies]
-    - Social impact metrics and case studies [Source: NGO reports, social research]
+    def make_model(self, model_name: str):
+        import google.generativeai as genai
+
+        model = genai.GenerativeModel(model_name)
+        model._client = self.client
+        return model
+
+    def warm_up(self):
+        # Counting tokens is free and opens the gRPC channel (DNS, TLS) the first generation would otherwise pay for
+        self.router.models[self.router.primary].count_tokens("warm-up")
+
+    def usage(self) -> Dict[str, object]:
+        return {
+            "role": self.role,
+            "key": self.key_id,
+            "requests": self.request_count,
+            "errors": self.error_count,
+            "circuit": self.breaker.state,
+            "routing": self.router.stats(),
+        }
     
-    CITATION REQUIREMENT: Every major statistic, claim, or example MUST include a source.
-    FORMATTING: Use ONLY markdown formatting. NO HTML tags whatsoever.
-    """
-)
+    def record_usage(self, response) -> Optional[TokenUsage]:
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return None
+        agent_tokens.inc(usage.prompt_token_count, agent=self.name, kind="prompt")
+        agent_tokens.inc(usage.candidates_token_count, agent=self.name, kind="output")
+        return TokenUsage(usage.prompt_token_count, usage.candidates_token_count)
+
+    def record_latency(self, outcome: str, seconds: float):
+        agent_call_seconds.observe(seconds, agent=self.name, outcome=outcome)
+        record_timing(self.name, seconds)
 
-con_agent = DebateAgent(
-    GEMINI_API_KEY_2,
-    "Gaius Contradictor - The Ruthless Realist", 
-    """You are one of the world's most feared debaters and critical thinkers - the expert who exposes uncomfortable truths.
-    You have investigated every failure, every unintended consequence, every hidden cost across industries and policies.
-    You speak with the authority of someone who has seen promising ideas crash and burn, and who values caution over optimism.""",
-    """
-    ARGUMENT STRATEGY FOR CON POSITION:
-    - Open with a devastating example of failure or unintended consequences
-    - Expose hidden costs, risks, or negative externalities with hard data AND SOURCES
-    - Reveal who really benefits vs. who pays the price
-    - Use fear of real, documented dangers with citations
-    - Show how similar initiatives have failed catastrophically with specific examples
-    - Highlight the safer, proven alternative approach
+    def record_failure(self, error: AgentError, seconds: float):
+        self.error_count += 1
+        cause = error.__cause__ if error.__cause__ is not None else error
+        agent_errors.inc(agent=self.name, type=type(cause).__name__)
+        self.record_latency("error", seconds)
     
-    EVIDENCE TYPES TO USE (WITH MANDATORY CITATIONS):
-    - Failure case studies and cautionary tales [Source: Historical records, case studies]
-    - Risk assessment data and safety statistics [Source: Safety agencies, regulatory bodies]
-    - Economic burden and cost-benefit analyses [Source: Economic research, government data]
-    - Regulatory warnings and expert concerns [Source: "Expert Name, Agency, Date"]
-    - Historical disasters and lessons learned [Source: Historical events, investigations]
-    - Victims' testimonials and impact studies [Source: Victim advocacy groups, research]
+    def build_prompt(self, topic: str, context: str = "") -> RenderedPrompt:
+        context_block = prompt_registry.template("agent_context").render(context=context).text if context else ""
+        prompt = self.template.render(topic=topic, context_block=context_block)
+        return prompt._replace(name=self.name)
     
-    CITATION REQUIREMENT: Every warning, statistic, or failure example MUST include a source.
-    FORMATTING: Use ONLY markdown formatting. NO HTML tags whatsoever.
-    """)
-
-mediator_agent = DebateAgent(
-    GEMINI_API_KEY_3,
-    "Lucius Moderator - The Truth Seeker",
-    """You are one of the world's most respected judges and analytical minds - incorruptible and brilliant.
-    You see through rhetoric to find truth. You have studied both sides of countless debates extensively.
-    You speak with the authority of someone who values evidence over emotion and seeks objective truth above all.""",
-    """
-    MEDIATION STRATEGY:
-    - Fact-check specific claims made by both sides with source verification
-    - Identify logical fallacies and weak reasoning
-    - Highlight the strongest point from each argument
-    - Reveal what both sides are NOT telling you
-    - Provide missing context or nuance with additional sources
-    - Suggest synthesis or middle-ground solutions
-    - Point out areas where more evidence is needed
-    - Verify the credibility and accuracy of cited sources
-    - Present analysis in a clear tabular format for easy comparison
+    async def generate_argument(self, topic: str, context: str = "") -> str:
+        return await self.generate(self.build_prompt(topic, context))
     
-    ANALYSIS FRAMEWORK:
-    - Verify factual claims and statistics against reliable sources
-    - Assess the quality and relevance of evidence and citations
-    - Identify emotional manipulation vs. logical reasoning
-    - Highlight confirmation bias or cherry-picking
-    - Check if sources are credible, current, and relevant
-    - Suggest additional perspectives to consider with source recommendations
-    - Rate the overall strength of each position based on source quality
+    async def generate(self, prompt: RenderedPrompt) -> str:
+        """Generate from a built prompt, raising AgentError once retries are exhausted"""
+        text, _, _ = await self.generate_routed(prompt)
+        return text
+
+    async def generate_routed(self, prompt: RenderedPrompt) -> Tuple[str, Served, Optional[TokenUsage]]:
+        """Like generate, but also report which model (and primary, fallback or hedge route) served it
+        and the token usage it reported, if any"""
+        prompt_registry.record(prompt)
+        loop = asyncio.get_running_loop()
+
+        def call_model(model):
+            return loop.run_in_executor(
+                agent_executor,
+                partial(model.generate_content, prompt.text, request_options={"timeout": resilience_policy.timeout}),
+            )
+
+        async def before_call():
+            # Hedges and fallbacks are real upstream calls, so they count against this key's rate limit too
+            self.request_count += 1
+            await self.limiter.acquire()
+
+        async def call():
+            self.request_count += 1
+            response, served = await self.router.call(call_model, before_call)
+            return response.text, served, self.record_usage(response)
+
+        prompt_estimated_tokens.inc(prompt.estimated_tokens, agent=self.name)
+        start = time.perf_counter()
+        try:
+            # Each model in the route has its own AGENT_TIMEOUT; this deadline covers the route as a whole
+            text, served, usage = await call_with_resilience(
+                self.role, call, resilience_policy, self.limiter, self.breaker, timeout=self.router.deadline
+            )
+        except AgentError as e:
+            self.record_failure(e, time.perf_counter() - start)
+            raise
+        self.record_latency("ok", time.perf_counter() - start)
+        agent_served.inc(agent=self.name, model=served.model, route=served.route)
+        # Clean up any HTML tags that might be generated
+        return sanitize(text), served, usage
     
-    MANDATORY OUTPUT FORMAT:
-    Structure your analysis using markdown tables to compare arguments side-by-side.
-    Include sections for: Key Claims, Evidence Quality, Logical Strength, Source Credibility, and Final Assessment.
+    def stream_argument(self, topic: str, context: str = "") -> AsyncIterator[str]:
+        return self.stream(self.build_prompt(topic, context))
     
-    CITATION VERIFICATION: Check if the sources cited are legitimate and accurately represented.
-    """)
+    async def stream(self, prompt: RenderedPrompt) -> AsyncIterator[str]:
+        """Yield cleaned text chunks as Gemini produces them, raising AgentError on failure"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        prompt_registry.record(prompt)
+
+        # Chunks already sent can't be taken back, so a stream is never retried;
+        # it still honours the per-key limiter and fails fast while the circuit is open
+        start = time.perf_counter()
+        if not self.breaker.allow():
+            error = CircuitOpenError(self.role, "upstream unavailable (circuit open), failing fast")
+            self.record_failure(error, time.perf_counter() - start)
+            raise error
+        await self.limiter.acquire()
+        self.request_count += 1
+        prompt_estimated_tokens.inc(prompt.estimated_tokens, agent=self.name)
+
+        # The SDK stream is a blocking iterator, so drain it on the agent executor
+        # and hand each chunk back to the event loop as it arrives. Streams always use
+        # the primary model: once chunks are sent there is nothing to hedge or fall back to.
+        model_name = self.router.primary
+        model = self.router.models[model_name]
+        # Set when the consumer goes away, so the executor thread stops pulling chunks (and spending quota)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                stream = model.generate_content(
+                    prompt.text, stream=True, request_options={"timeout": resilience_policy.timeout}
+                )
+                chunk = None
+                for chunk in stream:
+                    if stop.is_set():
+                        # Cancel the underlying gRPC stream rather than draining it
+                        cancel = getattr(getattr(stream, "_iterator", None), "cancel", None)
+                        if cancel is not None:
+                            cancel()
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk.text)
+                # Usage metadata arrives with the final chunk
+                self.record_usage(chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+        loop.run_in_executor(agent_executor, produce)
+        # Tags can be split across chunks, so sanitize incrementally
+        sanitizer = StreamSanitizer()
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is finished:
+                    break
+                if isinstance(chunk, Exception):
+                    if is_retryable(chunk):
+                        self.breaker.record_failure()
+                    error = AgentError(self.role, f"streaming failed: {chunk}")
+                    error.__cause__ = chunk
+                    self.record_failure(error, time.perf_counter() - start)
+                    raise error
+                text = sanitizer.feed(chunk)
+                if text:
+                    yield text
+        finally:
+            # Cancelled or closed early (client disconnected): stop the producer at its next chunk
+            stop.set()
+        tail = sanitizer.flush()
+        if tail:
+            yield tail
+        self.breaker.record_success()
+        self.record_latency("ok", time.perf_counter() - start)
+        agent_served.inc(agent=self.name, model=model_name, route="primary")
+
+# The three debate agents; personalities and argument styles live in app/templates
+AGENT_PERSONAS = {
+    "pro": (GEMINI_API_KEY_1, "Marcus Advocatus - The Visionary Champion"),
+    "con": (GEMINI_API_KEY_2, "Gaius Contradictor - The Ruthless Realist"),
+    "mediator": (GEMINI_API_KEY_3, "Lucius Moderator - The Truth Seeker"),
+}
+
+def build_agent(name: str) -> DebateAgent:
+    api_key, role = AGENT_PERSONAS[name]
+    return DebateAgent(
+        api_key,
+        role,
+        prompt_registry.text(f"{name}_personality"),
+        prompt_registry.text(f"{name}_strategy"),
+        name=name,
+        route=agent_routes[name],
+    )
+
+class LazyAgents(Mapping):
+    """The debate agents by name, each built on first use so importing the app stays fast"""
+
+    def __init__(self, factory: Callable[[str], DebateAgent], names: Tuple[str, ...]):
+        self.factory = factory
+        self.names = names
+        self.built: Dict[str, DebateAgent] = {}
+        self.lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> DebateAgent:
+        agent = self.built.get(name)
+        if agent is None:
+            if name not in self.names:
+                raise KeyError(name)
+            with self.lock:
+                if name not in self.built:
+                    self.built[name] = self.factory(name)
+                agent = self.built[name]
+        return agent
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    async def load(self, *names: str) -> List[DebateAgent]:
+        """Return the named agents, building any missing ones off the event loop"""
+        if any(name not in self.built for name in names):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, lambda: [self[name] for name in names])
+        return [self.built[name] for name in names]
+
+agents = LazyAgents(build_agent, AGENT_NAMES)
 
 # Pydantic models
 class DebateRequest(BaseModel):
     topic: str
+    mediator_mode: Optional[str] = None  # full or digest; defaults to MEDIATOR_MODE
+    reuse_similar: Optional[bool] = None  # serve a near-identical archived topic's debate; defaults to TOPIC_REUSE
 class IntenseDebateRequest(BaseModel):
     topic: str
     intensity: str = "high"  # low, medium, high, extreme
+    mediator_mode: Optional[str] = None
+    reuse_similar: Optional[bool] = None
+class StreamDebateRequest(BaseModel):
+    topic: str
+    intensity: Optional[str] = None  # omit for a standard debate
+    mediator_mode: Optional[str] = None
+
+class RoundsDebateRequest(BaseModel):
+    topic: str
+    rounds: Optional[int] = None  # defaults to DEBATE_ROUNDS
+    intensity: Optional[str] = None  # sets the opening round's briefing
+
+class BatchDebateItem(BaseModel):
+    topic: str
+    intensity: Optional[str] = None  # omit for a standard /debate
+    mediator_mode: Optional[str] = None
+class BatchDebateRequest(BaseModel):
+    items: List[BatchDebateItem]
+    concurrency: Optional[int] = None  # lower than the server-wide cap if set
+
+class DebateJobRequest(BaseModel):
+    topic: str
+    intensity: Optional[str] = None  # omit for a standard /debate
 
 class DebateResponse(BaseModel):
     topic: str
@@ -203,116 +494,678 @@ class DebateResponse(BaseModel):
     con_argument: str
     mediator_analysis: str
     summary: str
+    cached: bool = False
+    errors: Dict[str, str] = {}  # role -> reason, for a partial result
+    prompt_tokens: Dict[str, int] = {}  # role -> estimated prompt tokens sent
+    mediator_mode: str = "full"
+    mediator_prompt_tokens: Dict[str, int] = {}  # mode -> estimated mediator prompt tokens, for comparison
+    models: Dict[str, str] = {}  # role -> model that served it
+    id: Optional[str] = None  # archive id, for GET /debate/{id}; only complete debates are archived
+    similarity: Optional[float] = None  # set when reused from an archived debate on a near-identical topic
+
+class DebateJob(BaseModel):
+    id: str
+    topic: str
+    intensity: Optional[str]
+    status: str  # queued, running, completed, failed
+    pro_argument: Optional[str]  # partial results, filled in as each agent finishes
+    con_argument: Optional[str]
+    mediator_analysis: Optional[str]
+    result: Optional[DebateResponse]
+    error: Optional[str]
+    attempts: int
+    created_at: float
+    updated_at: float
+
+class DebateError(Exception):
+    """A debater failed, so there is nothing for the mediator to judge"""
+
+    def __init__(self, errors: Dict[str, str]):
+        super().__init__("; ".join(errors.values()))
+        self.errors = errors
+
+# Debate prompt builders shared by the blocking and streaming endpoints
+MEDIATOR_TASKS = {
+    "standard": "FACT-CHECK AND ANALYZE THE DEBATE",
+    "intense": "RENDER SUPREME JUDGMENT",
+}
+
+def build_debater_prompts(topic: str, intensity: Optional[str] = None) -> Dict[str, str]:
+    """Build the pro and con prompts; an intensity selects the intense debate variant"""
+    return {side: prompt_registry.debater(side, intensity).render(topic=topic).text for side in ("pro", "con")}
+
+def verification_section(intensity: Optional[str] = None) -> str:
+    return prompt_registry.text("debate_verification" if intensity is None else "intense_verification")
+
+def build_mediator_prompt(
+    topic: str,
+    pro_argument: str,
+    con_argument: str,
+    intensity: Optional[str] = None,
+    source_verification: Optional[str] = None,
+) -> Tuple[str, str]:
+    """Build the mediator's (task, context) pair from both finished arguments"""
+    if source_verification is None:
+        source_verification = verification_section(intensity)
+    if intensity is None:
+        context = prompt_registry.template("debate_mediator").render(
+            topic=topic, pro_argument=pro_argument, con_argument=con_argument, source_verification=source_verification
+        )
+        return MEDIATOR_TASKS["standard"], context.text
+    context = prompt_registry.template("intense_mediator").render(
+        topic=topic,
+        pro_argument=pro_argument,
+        con_argument=con_argument,
+        intensity_label=intensity.upper(),
+        source_verification=source_verification,
+    )
+    return MEDIATOR_TASKS["intense"], context.text
+
+def resolve_mediator_mode(mode: Optional[str]) -> str:
+    if mode is None:
+        return MEDIATOR_MODE
+    if mode not in MEDIATOR_MODES:
+        raise HTTPException(status_code=400, detail=f"mediator_mode must be one of {', '.join(MEDIATOR_MODES)}")
+    return mode
+
+def argument_digest(argument: str) -> str:
+    return render_digest(digest_argument(argument))
+
+async def source_verification(
+    digests: Dict[str, ArgumentDigest], intensity: Optional[str] = None
+) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+    """The mediator prompt's source verification section, the cited sources it has to rate (key -> source)
+    and the labels of sources rated in earlier debates, which it is handed instead of verifying them again"""
+    citations = extract_citations(digests["pro"], digests["con"]) if citation_memo is not None else {}
+    if not citations:
+        # Nothing the memo could answer: the mediator verifies claim by claim as usual
+        return verification_section(intensity), {}, {}
+    known, unseen = await asyncio.get_running_loop().run_in_executor(None, citation_memo.lookup, citations)
+    citation_lookups.inc(len(known), result="hit")
+    for result in unseen.values():
+        citation_lookups.inc(result=result)
+    # Claims are still checked one by one; only the credibility of each source is taken from the memo.
+    # Known sources get a one-line rating that the arguments then cite by label, so the prompt shrinks as
+    # the memo fills up, and unseen ones get a verdict row each for the memo to learn from.
+    labels = source_labels(known)
+    sections = []
+    if known:
+        verdicts = render_verdicts(known, labels)
+        sections.append(prompt_registry.template("citation_known").render(sources=verdicts).text)
+    sections.append(verification_section(intensity))
+    if unseen:
+        sources = "\n".join(f"- {citations[key]}" for key in unseen)
+        sections.append(prompt_registry.template("citation_unverified").render(sources=sources).text)
+    return "\n\n".join(sections), {key: citations[key] for key in unseen}, labels
+
+async def remember_verdicts(analysis: str, unverified: Dict[str, str]):
+    """Store the mediator's verdicts on the sources it was asked to verify"""
+    if citation_memo is None or not unverified:
+        return
+    verdicts = parse_verdicts(analysis)
+    await asyncio.get_running_loop().run_in_executor(
+        None, citation_memo.record, {key: verdict for key, verdict in verdicts.items() if key in unverified}
+    )
+
+def build_mediator_prompts(
+    topic: str,
+    arguments: Dict[str, str],
+    digests: Dict[str, ArgumentDigest],
+    intensity: Optional[str] = None,
+    source_verification: Optional[str] = None,
+    labels: Optional[Dict[str, str]] = None,
+) -> Dict[str, RenderedPrompt]:
+    """Render the mediator prompt over the full arguments and over their digests, keyed by mode"""
+    label = None
+    if labels:
+        # Sources the verification section already rates are cited by label
+        arguments = {role: cite_by_label(argument, labels) for role, argument in arguments.items()}
+        label = partial(label_for, labels=labels)
+    rendered = {role: render_digest(digest, label) for role, digest in digests.items()}
+    prompts = {}
+    for mode, parts in (("full", arguments), ("digest", rendered)):
+        task, context = build_mediator_prompt(topic, parts["pro"], parts["con"], intensity, source_verification)
+        prompts[mode] = agents["mediator"].build_prompt(task, context)
+        mediator_prompt_size.observe(prompts[mode].estimated_tokens, mode=mode)
+    return prompts
+
+def build_summary(topic: str, intensity: Optional[str] = None) -> str:
+    name = "debate_summary" if intensity is None else "intense_summary"
+    return prompt_registry.template(name).render(topic=topic).text
+
+async def run_debate(
+    topic: str,
+    intensity: Optional[str] = None,
+    on_progress: Optional[Callable[[str, str], None]] = None,
+    completed: Optional[Dict[str, str]] = None,
+    mediator_mode: str = "full",
+) -> DebateResponse:
+    """Generate a debate; on_progress(role, text) fires as each part lands, and roles in completed are reused"""
+    completed = completed or {}
+    digests: Dict[str, ArgumentDigest] = {}
+    models: Dict[str, str] = {}
+    pro_agent, con_agent, mediator_agent = await agents.load("pro", "con", "mediator")
+
+    async def generate_role(role: str, agent: DebateAgent, prompt: RenderedPrompt) -> str:
+        if completed.get(role):
+            return completed[role]
+        text, served, _ = await agent.generate_routed(prompt)
+        models[role] = served.model
+        if on_progress:
+            on_progress(role, text)
+        return text
+
+    async def generate_argument(role: str, agent: DebateAgent, prompt: RenderedPrompt) -> str:
+        text = await generate_role(role, agent, prompt)
+        # Digest each argument as it lands, while the other side may still be generating
+        digests[role] = digest_argument(text)
+        return text
+
+    # Generate arguments concurrently for efficiency
+    prompts = build_debater_prompts(topic, intensity)
+    pro_prompt = pro_agent.build_prompt(prompts["pro"])
+    con_prompt = con_agent.build_prompt(prompts["con"])
+    prompt_tokens = {"pro": pro_prompt.estimated_tokens, "con": con_prompt.estimated_tokens}
+    
+    with timed(debate_phase_seconds, "debaters"):
+        results = await asyncio.gather(
+            generate_argument("pro", pro_agent, pro_prompt),
+            generate_argument("con", con_agent, con_prompt),
+            return_exceptions=True
+        )
+    errors = {}
+    for role, result in zip(("pro", "con"), results):
+        if isinstance(result, AgentError):
+            errors[role] = str(result)
+        elif isinstance(result, BaseException):
+            raise result
+    # Don't spend a mediator generation fact-checking a missing argument
+    if errors:
+        raise DebateError(errors)
+    pro_argument, con_argument = results
+    
+    # Generate mediator analysis based on both arguments, or on their digests,
+    # handing it the verdicts on sources it has already assessed in earlier debates
+    arguments = {"pro": pro_argument, "con": con_argument}
+    verification, unverified, labels = await source_verification(digests, intensity)
+    mediator_prompts = build_mediator_prompts(topic, arguments, digests, intensity, verification, labels)
+    mediator_prompt = mediator_prompts[mediator_mode]
+    prompt_tokens["mediator"] = mediator_prompt.estimated_tokens
+    try:
+        with timed(debate_phase_seconds, "mediation"):
+            mediator_analysis = await generate_role("mediator", mediator_agent, mediator_prompt)
+        await remember_verdicts(mediator_analysis, unverified)
+    except AgentError as e:
+        # Both arguments are still worth returning without the analysis
+        mediator_analysis = ""
+        errors["mediator"] = str(e)
+    
+    debate = DebateResponse(
+        topic=topic,
+        pro_argument=pro_argument,
+        con_argument=con_argument,
+        mediator_analysis=mediator_analysis,
+        summary=build_summary(topic, intensity),
+        errors=errors,
+        prompt_tokens=prompt_tokens,
+        mediator_mode=mediator_mode,
+        mediator_prompt_tokens={mode: prompt.estimated_tokens for mode, prompt in mediator_prompts.items()},
+        models=models
+    )
+    return await archive_debate(debate, intensity)
+
+async def archive_debate(debate: DebateResponse, intensity: Optional[str] = None) -> DebateResponse:
+    """Store a complete debate in the archive and stamp it with its id"""
+    if debate_archive is None or debate.errors:
+        return debate
+    record = debate.model_dump(exclude={"cached", "id", "similarity"})
+    # Compressing the body for the archive takes a few milliseconds, so it runs off the event loop
+    loop = asyncio.get_running_loop()
+    debate.id = await loop.run_in_executor(None, debate_archive.save, record, intensity)
+    if topic_index is not None:
+        topic_index.add(debate.id, debate.topic, topic_scope(intensity, debate.mediator_mode))
+    return debate
+
+def topic_scope(intensity: Optional[str], mediator_mode: str) -> str:
+    # Only debates generated the same way are interchangeable
+    return f"{intensity or '-'}|{mediator_mode}"
+
+async def find_similar_debate(topic: str, intensity: Optional[str], mediator_mode: str) -> Optional[DebateResponse]:
+    """The archived debate on the most similar earlier topic, if one clears TOPIC_SIMILARITY_THRESHOLD
+    and is younger than TOPIC_REUSE_MAX_AGE"""
+    if topic_index is None:
+        return None
+    start = time.perf_counter()
+    matches = topic_index.query(topic, topic_scope(intensity, mediator_mode))
+    topic_lookup_seconds.observe(time.perf_counter() - start)
+    loop = asyncio.get_running_loop()
+    for match in matches:
+        archived = await loop.run_in_executor(None, debate_archive.body, match.key)
+        if archived is not None and time.time() - archived[0] <= TOPIC_REUSE_MAX_AGE:
+            topic_lookups.inc(result="hit")
+            debate = json.loads(archived[1])
+            return DebateResponse(**dict(debate, similarity=round(match.score, 3)))
+    topic_lookups.inc(result="stale" if matches else "miss")
+    return None
+
+async def load_topic_index(page_size: int = 1000):
+    """Index every archived topic, a page at a time off the event loop"""
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    after = 0
+
+    def index_page(after: int) -> Optional[int]:
+        rows = debate_archive.topics(after, page_size)
+        for seq, archived_id, topic, intensity, mediator_mode in rows:
+            topic_index.add(archived_id, topic, topic_scope(intensity, mediator_mode))
+        return rows[-1][0] if rows else None
+
+    while after is not None:
+        after = await loop.run_in_executor(None, index_page, after)
+    logger.info("Indexed %d archived topics in %.2fs", len(topic_index), time.perf_counter() - start)
 
-@app.get("/")
+async def run_debate_job(job: dict, on_progress: Callable[[str, str], None]) -> dict:
+    # Arguments saved before a worker restart are reused rather than regenerated
+    completed = {role: job[column] for role, column in PARTIAL_COLUMNS.items() if job[column]}
+    debate = await run_debate(
+        job["topic"], job["intensity"], on_progress=on_progress, completed=completed, mediator_mode=MEDIATOR_MODE
+    )
+    return debate.model_dump()
+
+job_queue = JobQueue(
+    JobStore(DEBATE_JOBS_PATH, lease_seconds=DEBATE_JOBS_LEASE, max_attempts=DEBATE_JOBS_MAX_ATTEMPTS),
+    run_debate_job,
+    workers=DEBATE_JOB_WORKERS,
+    poll_interval=DEBATE_JOBS_POLL_INTERVAL,
+)
+
+def is_cacheable(debate: dict) -> bool:
+    # Never pin a partial debate in the cache
+    return not debate["errors"]
+
+async def get_debate(
+    endpoint: str,
+    topic: str,
+    intensity: Optional[str] = None,
+    mediator_mode: str = "full",
+    reuse_similar: Optional[bool] = None,
+) -> DebateResponse:
+    """Serve a debate from the cache, or from the archive for a near-identical topic, generating it
+    (once per burst of identical requests) on a miss"""
+    if reuse_similar is None:
+        reuse_similar = TOPIC_REUSE
+    # Digest-mode analyses differ from full ones, so they are cached separately
+    if mediator_mode != "full":
+        endpoint = f"{endpoint}+{mediator_mode}"
+    key = cache_key(endpoint, topic, intensity)
+    # The cache comes first, so DEBATE_CACHE_TTL still bounds how long a repeated topic is served
+    if debate_cache is not None:
+        debate = await debate_cache.get(key)
+        if debate is not None:
+            cache_requests.inc(result="hit")
+            return DebateResponse(**debate, cached=True)
+    if reuse_similar:
+        similar = await find_similar_debate(topic, intensity, mediator_mode)
+        if similar is not None:
+            return similar
+    if debate_cache is None:
+        return await run_debate(topic, intensity, mediator_mode=mediator_mode)
+
+    async def generate() -> dict:
+        debate = await run_debate(topic, intensity, mediator_mode=mediator_mode)
+        return debate.model_dump(exclude={"cached"})
+
+    debate, cached = await debate_cache.get_or_create(key, generate, should_store=is_cacheable)
+    cache_requests.inc(result="hit" if cached else "miss")
+    return DebateResponse(**debate, cached=cached)
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_debate_events(
+    topic: str, intensity: Optional[str] = None, mediator_mode: str = "full"
+) -> AsyncIterator[str]:
+    """Stream a debate as SSE events: pro/con chunks interleaved, then mediator, summary and done"""
+    queue: asyncio.Queue = asyncio.Queue()
+    arguments: Dict[str, List[str]] = {"pro": [], "con": []}
+    digests: Dict[str, ArgumentDigest] = {}
+    pro_agent, con_agent, mediator_agent = await agents.load("pro", "con", "mediator")
+    errors: Dict[str, str] = {}
+    prompts = build_debater_prompts(topic, intensity)
+    agent_prompts = {"pro": pro_agent.build_prompt(prompts["pro"]), "con": con_agent.build_prompt(prompts["con"])}
+    prompt_tokens = {role: prompt.estimated_tokens for role, prompt in agent_prompts.items()}
+
+    async def pump(role: str, agent: DebateAgent):
+        try:
+            async for chunk in agent.stream(agent_prompts[role]):
+                arguments[role].append(chunk)
+                await queue.put((role, chunk))
+            digests[role] = digest_argument("".join(arguments[role]))
+        except AgentError as e:
+            errors[role] = str(e)
+            await queue.put(("error", {"role": role, "message": str(e)}))
+        finally:
+            await queue.put((role, None))
+
+    tasks = [
+        asyncio.create_task(pump("pro", pro_agent)),
+        asyncio.create_task(pump("con", con_agent)),
+    ]
+    try:
+        # Forward pro and con chunks in the order they are produced
+        phase_start = time.perf_counter()
+        pending = len(tasks)
+        while pending:
+            role, chunk = await queue.get()
+            if chunk is None:
+                pending -= 1
+            elif role == "error":
+                yield sse_event("error", chunk)
+            else:
+                yield sse_event(role, {"text": chunk})
+        debate_phase_seconds.observe(time.perf_counter() - phase_start, phase="debaters")
+
+        # Without both arguments there is nothing for the mediator to judge
+        if errors:
+            return
+
+        # The mediator starts as soon as both debaters have finished
+        pro_argument = "".join(arguments["pro"])
+        con_argument = "".join(arguments["con"])
+        verification, unverified, labels = await source_verification(digests, intensity)
+        mediator_prompts = build_mediator_prompts(
+            topic, {"pro": pro_argument, "con": con_argument}, digests, intensity, verification, labels
+        )
+        mediator_prompt = mediator_prompts[mediator_mode]
+        prompt_tokens["mediator"] = mediator_prompt.estimated_tokens
+        mediator_parts = []
+        phase_start = time.perf_counter()
+        try:
+            # Closed with this generator, so a disconnect mid-analysis stops the mediator's stream too
+            async with aclosing(mediator_agent.stream(mediator_prompt)) as chunks:
+                async for chunk in chunks:
+                    mediator_parts.append(chunk)
+                    yield sse_event("mediator", {"text": chunk})
+            await remember_verdicts("".join(mediator_parts), unverified)
+        except AgentError as e:
+            errors["mediator"] = str(e)
+            mediator_parts = []
+            yield sse_event("error", {"role": "mediator", "message": str(e)})
+        debate_phase_seconds.observe(time.perf_counter() - phase_start, phase="mediation")
+
+        summary = build_summary(topic, intensity)
+        yield sse_event("summary", {"text": summary})
+
+        debate = DebateResponse(
+            topic=topic,
+            pro_argument=pro_argument,
+            con_argument=con_argument,
+            mediator_analysis="".join(mediator_parts),
+            summary=summary,
+            errors=errors,
+            prompt_tokens=prompt_tokens,
+            mediator_mode=mediator_mode,
+            mediator_prompt_tokens={mode: prompt.estimated_tokens for mode, prompt in mediator_prompts.items()},
+            models={role: agents[role].router.primary for role in AGENT_NAMES if role not in errors}
+        )
+        debate = await archive_debate(debate, intensity)
+        yield sse_event("done", debate.model_dump())
+    finally:
+        # Stop generating if the client disconnects mid-stream
+        for task in tasks:
+            task.cancel()
+
+def round_event(result: RoundResult) -> dict:
+    return {
+        "round": result.round,
+        "stage": result.stage,
+        "seconds": result.seconds,
+        "prompt_tokens": {role: turn.prompt_tokens for role, turn in result.turns.items()},
+        "output_tokens": {role: turn.output_tokens for role, turn in result.turns.items()},
+    }
+
+async def stream_round_events(topic: str, rounds: int, intensity: Optional[str] = None) -> AsyncIterator[str]:
+    """Stream a multi-round debate as SSE: a turn event as each side finishes, a round event per round, then done"""
+    pro_agent, con_agent = await agents.load("pro", "con")
+    debate = MultiRoundDebate(
+        topic,
+        {"pro": pro_agent, "con": con_agent},
+        prompt_registry,
+        opening=build_debater_prompts(topic, intensity),
+        digest=argument_digest,
+        rounds=rounds,
+    )
+    try:
+        async for kind, item in debate.run():
+            if kind == "turn":
+                yield sse_event("turn", item._asdict())
+                continue
+            debate_round_seconds.observe(item.seconds, stage=item.stage)
+            debate_round_prompt_tokens.observe(
+                sum(turn.prompt_tokens for turn in item.turns.values()), stage=item.stage
+            )
+            yield sse_event("round", round_event(item))
+    except TurnError as e:
+        yield sse_event("error", {"round": e.round, "role": e.role, "message": str(e)})
+        return
+    transcript = [
+        {**round_event(result), "turns": {role: turn.text for role, turn in result.turns.items()}}
+        for result in debate.results
+    ]
+    yield sse_event("done", {"topic": topic, "intensity": intensity, "rounds": transcript})
+
+async def stream_batch_results(items: List[BatchDebateItem], concurrency: int) -> AsyncIterator[str]:
+    """Run a batch of debates, yielding one NDJSON line per item as each completes"""
+    request_semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_item(index: int, item: BatchDebateItem) -> dict:
+        result = {"index": index, "topic": item.topic, "intensity": item.intensity}
+        topic = item.topic.strip()
+        if not topic:
+            return {**result, "status": "error", "error": "Topic cannot be empty"}
+        async with request_semaphore, batch_semaphore:
+            try:
+                endpoint = "debate" if item.intensity is None else "intense"
+                debate = await get_debate(endpoint, topic, item.intensity, resolve_mediator_mode(item.mediator_mode))
+            except DebateError as e:
+                return {**result, "status": "error", "error": f"Debate generation failed: {str(e)}"}
+            except Exception as e:
+                # One failing topic must not take down the rest of the batch
+                return {**result, "status": "error", "error": f"Internal server error: {str(e)}"}
+        return {**result, "status": "ok", "debate": debate.model_dump()}
+
+    tasks = [asyncio.create_task(run_item(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield json.dumps(await next_done) + "\n"
+    finally:
+        # Stop generating if the client disconnects mid-batch
+        for task in tasks:
+            task.cancel()
+
+router = APIRouter()
+
+async def add_server_timing(request: Request, call_next):
+    timings: Dict[str, float] = {}
+    token = request_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_timings.reset(token)
+    timings["total"] = (time.perf_counter() - start) * 1000
+    response.headers["Server-Timing"] = server_timing_header(timings)
+    return response
+
+@router.get("/")
 def read_root():
     return {"message": "Welcome to Vox Dualis - The Ethical Debate Arena"}
 
-@app.post("/debate", response_model=DebateResponse)
+@router.post("/debate", response_model=DebateResponse)
 async def generate_debate(request: DebateRequest):
     try:
         topic = request.topic.strip()
         if not topic:
             raise HTTPException(status_code=400, detail="Topic cannot be empty")
-        # Enhanced prompts for more compelling arguments
-        enhanced_topic_context = f"""
-        DEBATE MODERATOR BRIEFING: A distinguished audience gathers to hear expert arguments on: "{topic}"
-        
-        This is not an academic exercise - real decisions hang in the balance.
-        The audience includes skeptics, believers, and undecided citizens who need CONVINCING EVIDENCE WITH SOURCES.
-        
-        Each speaker has 300 words to change minds and shape the future.
-        Arguments must be backed by facts, examples, compelling logic, AND CREDIBLE SOURCES.
-        Weak reasoning or unsourced claims will be immediately exposed and ridiculed.
-        
-        MANDATORY: Every major claim must include a source citation using this format:
-        [Source: Organization/Study, Year] or [Source: "Expert Name, Title"]
-        
-        THE STAKES ARE HIGH. MAKE YOUR CASE COUNT WITH PROOF.
-        """
-        
-        # Generate arguments concurrently for efficiency
-        pro_task = pro_agent.generate_argument(f"{enhanced_topic_context}\n\nARGUE POWERFULLY FOR: {topic}")
-        con_task = con_agent.generate_argument(f"{enhanced_topic_context}\n\nARGUE RUTHLESSLY AGAINST: {topic}")
-        
-        pro_argument, con_argument = await asyncio.gather(pro_task, con_task)
-        
-        # Generate mediator analysis based on both arguments
-        # Enhanced mediator analysis with fact-checking focus
-        mediator_context = f"""
-        EXPERT ANALYSIS CHAMBERS - CRITICAL REVIEW REQUIRED
-        
-        Topic: {topic}
-        
-        MARCUS ADVOCATUS argued:
-        {pro_argument}
-        
-        GAIUS CONTRADICTOR countered:
-        {con_argument}
-        
-        Your task: Dissect these arguments with surgical precision and present your analysis in a clear tabular format.
-        
-        REQUIRED OUTPUT FORMAT:
-        Use markdown tables to organize your analysis. Structure your response as follows:
-        
-        FORMATTING REQUIREMENTS:
-        - Use ONLY markdown syntax - NO HTML tags like <br>, <b>, <i>
-        - For line breaks within table cells, use double spaces followed by newline
-        - Keep table cell content concise but informative
-        
-        ## Argument Comparison Summary
-        
-        | Aspect | Marcus Advocatus (PRO) | Gaius Contradictor (CON) |
-        |--------|------------------------|---------------------------|
-        | **Main Claim** | [Summarize key argument] | [Summarize key argument] |
-        | **Key Evidence** | [List 2-3 strongest pieces] | [List 2-3 strongest pieces] |
-        | **Source Quality** | [Rate: High/Medium/Low + reasoning] | [Rate: High/Medium/Low + reasoning] |
-        | **Logical Strength** | [Assess reasoning quality] | [Assess reasoning quality] |
-        | **Weaknesses** | [Identify gaps/flaws] | [Identify gaps/flaws] |
-        
-        ## Evidence Verification
-        | Claim | Source Cited | Credibility Assessment | Accuracy |
-        |-------|--------------|------------------------|-----------|
-        | [Specific claim 1] | [Source name] | [High/Medium/Low] | [Verified/Questionable/False] |
-        | [Specific claim 2] | [Source name] | [High/Medium/Low] | [Verified/Questionable/False] |
-        
-        ## Final Assessment
-        | Category | Winner | Reasoning |
-        |----------|---------|-----------|
-        | **Evidence Quality** | [Marcus/Gaius/Tie] | [Brief explanation] |
-        | **Logical Reasoning** | [Marcus/Gaius/Tie] | [Brief explanation] |
-        | **Source Credibility** | [Marcus/Gaius/Tie] | [Brief explanation] |
-        | **Overall Strength** | [Marcus/Gaius/Tie] | [Comprehensive reasoning] |
-        
-        Provide detailed analysis within each table cell while maintaining clarity and objectivity.
-        """
-        
-        mediator_analysis = await mediator_agent.generate_argument(
-            "FACT-CHECK AND ANALYZE THE DEBATE", 
-            mediator_context
-        )
-        
-        # Create a compelling summary that emphasizes the gravity
-        summary = f"""� The expert panel has heard passionate testimony on '{topic}'. 
-        
-        Marcus Advocatus painted a vision of progress and opportunity, while Gaius Contradictor exposed hidden dangers and costs. Lucius Moderator has weighed the evidence with impartial wisdom.
-        
-        The decision now rests with you. Choose wisely - the future may depend on it."""
-        return DebateResponse(
-            topic=topic,
-            pro_argument=pro_argument,
-            con_argument=con_argument,
-            mediator_analysis=mediator_analysis,
-            summary=summary
+        return await get_debate(
+            "debate",
+            topic,
+            mediator_mode=resolve_mediator_mode(request.mediator_mode),
+            reuse_similar=request.reuse_similar,
         )
         
+    except HTTPException:
+        raise
+    except DebateError as e:
+        raise HTTPException(status_code=503, detail=f"Debate generation failed: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-@app.get("/health")
+@router.post("/debate/stream")
+async def stream_debate(request: StreamDebateRequest):
+    """Stream a debate token-by-token as server-sent events tagged by role"""
+    topic = request.topic.strip()
+    if not topic:
+        raise HTTPException(status_code=400, detail="Topic cannot be empty")
+    return StreamingResponse(
+        stream_debate_events(topic, request.intensity, resolve_mediator_mode(request.mediator_mode)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/debate/rounds")
+async def stream_debate_rounds(request: RoundsDebateRequest):
+    """Stream a multi-round debate (opening, rebuttals, conclusion) as server-sent events"""
+    topic = request.topic.strip()
+    if not topic:
+        raise HTTPException(status_code=400, detail="Topic cannot be empty")
+    rounds = request.rounds or DEBATE_ROUNDS
+    if not 1 <= rounds <= DEBATE_MAX_ROUNDS:
+        raise HTTPException(status_code=400, detail=f"Rounds must be between 1 and {DEBATE_MAX_ROUNDS}")
+    return StreamingResponse(
+        stream_round_events(topic, rounds, request.intensity),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/debates/batch")
+async def generate_debate_batch(request: BatchDebateRequest):
+    """Generate many debates with bounded concurrency, streaming NDJSON results as they complete"""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one topic")
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch cannot contain more than {BATCH_MAX_ITEMS} topics")
+    concurrency = min(request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    if concurrency < 1:
+        raise HTTPException(status_code=400, detail="Concurrency must be at least 1")
+    for item in request.items:
+        resolve_mediator_mode(item.mediator_mode)
+    return StreamingResponse(
+        stream_batch_results(request.items, concurrency),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/debate/jobs", response_model=DebateJob, status_code=202)
+def create_debate_job(request: DebateJobRequest):
+    """Queue a debate and return its job id immediately; poll GET /debate/jobs/{id} for progress"""
+    topic = request.topic.strip()
+    if not topic:
+        raise HTTPException(status_code=400, detail="Topic cannot be empty")
+    return job_queue.submit(topic, request.intensity)
+
+@router.get("/debate/jobs/{job_id}", response_model=DebateJob)
+def get_debate_job(job_id: str):
+    job = job_queue.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/debates")
+def list_debates(limit: int = 20, before: Optional[int] = None):
+    """Archived debates, newest first; pass `next` back as `before` for the following page"""
+    if debate_archive is None:
+        raise HTTPException(status_code=404, detail="The debate archive is disabled")
+    if not 1 <= limit <= DEBATE_ARCHIVE_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {DEBATE_ARCHIVE_PAGE_SIZE}")
+    items, cursor = debate_archive.list(limit, before)
+    return {"items": items, "next": cursor}
+
+@router.get("/topics/similar")
+def similar_topics(topic: str, intensity: Optional[str] = None, mediator_mode: Optional[str] = None, limit: int = 5):
+    """Archived debates on near-identical topics, best first, so a client can offer one before generating"""
+    if topic_index is None:
+        return {"enabled": False, "matches": []}
+    scope = topic_scope(intensity, resolve_mediator_mode(mediator_mode))
+    matches = topic_index.query(topic, scope, limit=max(1, min(limit, 20)))
+    return {
+        "enabled": True,
+        "matches": [{"id": match.key, "topic": match.topic, "similarity": round(match.score, 3)} for match in matches],
+    }
+
+@router.get("/debate/{debate_id}")
+def get_archived_debate(debate_id: str, request: Request):
+    """An archived debate; its ETag never changes, so repeat views get a 304"""
+    archived = debate_archive.get(debate_id) if debate_archive is not None else None
+    if archived is None:
+        archive_requests.inc(result="not_found")
+        raise HTTPException(status_code=404, detail="Debate not found")
+    encoding = choose_encoding(request.headers.get("accept-encoding"), archived.encodings)
+    headers = {
+        # One tag per content coding, so caches never mix up the gzip, brotli and plain bodies
+        "ETag": archived.etag(encoding),
+        # Content-addressed, so a given id always has the same body
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        archive_requests.inc(result="not_modified")
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    archive_requests.inc(result="ok")
+    return Response(archived.bodies[encoding or "identity"], media_type="application/json", headers=headers)
+
+@router.get("/health")
 def health_check():
     return {"status": "healthy", "message": "Vox Dualis backend is running"}
-@app.post("/debate/intense", response_model=DebateResponse)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus text exposition of agent, phase, token, error and cache metrics"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/cache/stats")
+def cache_stats():
+    if debate_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **debate_cache.stats()}
+
+@router.get("/archive/stats")
+def archive_stats():
+    if debate_archive is None:
+        return {"enabled": False}
+    stats = {"enabled": True, **debate_archive.stats()}
+    if topic_index is not None:
+        stats["topic_index"] = topic_index.stats()
+    return stats
+
+@router.get("/citations/stats")
+def citation_stats():
+    """Source verdict memo size and hit rate"""
+    if citation_memo is None:
+        return {"enabled": False}
+    return {"enabled": True, **citation_memo.stats()}
+
+@router.get("/prompts/stats")
+def prompt_stats():
+    """Prompt calls, characters and estimated tokens sent, per agent"""
+    return prompt_registry.stats()
+
+@router.get("/agents/usage")
+def agents_usage():
+    """Per-agent request counts, one entry per API key; agents not used yet are not listed"""
+    return {name: agent.usage() for name, agent in agents.built.items()}
+@router.post("/debate/intense", response_model=DebateResponse)
 async def generate_intense_debate(request: IntenseDebateRequest):
     """Generate an extremely intense, fact-heavy debate with maximum persuasive power"""
     try:
@@ -322,142 +1175,64 @@ async def generate_intense_debate(request: IntenseDebateRequest):
         if not topic:
             raise HTTPException(status_code=400, detail="Topic cannot be empty")
         
-        # Ultra-enhanced prompts based on intensity
-        intensity_modifiers = {
-            "extreme": {
-                "urgency": "CIVILIZATION-DEFINING CRISIS",
-                "stakes": "The fate of humanity hangs in the balance",
-                "evidence_requirement": "Use SHOCKING statistics, Nobel Prize research, and world-changing examples",
-                "word_count": "400-500 words of devastating persuasion"
-            },
-            "high": {
-                "urgency": "CRITICAL DECISION POINT", 
-                "stakes": "Millions of lives and billions of dollars at stake",
-                "evidence_requirement": "Use concrete data, peer-reviewed studies, and real case studies",
-                "word_count": "300-350 words of compelling evidence"
-            },
-            "medium": {
-                "urgency": "IMPORTANT CHOICE",
-                "stakes": "Significant consequences for society",
-                "evidence_requirement": "Use verified facts, expert opinions, and documented examples", 
-                "word_count": "250-300 words of solid reasoning"
-            }
-        }
-        
-        modifier = intensity_modifiers.get(intensity, intensity_modifiers["high"])
-        
-        ultra_enhanced_context = f"""
-        🚨 {modifier['urgency']} ALERT 🚨
-        
-        EXPERT PANEL EMERGENCY SESSION ON: "{topic}"
-        
-        {modifier['stakes']}. This is NOT theoretical - real consequences await.
-        
-        SPEAKER REQUIREMENTS:
-        - {modifier['evidence_requirement']}
-        - Deliver {modifier['word_count']}
-        - Every claim must be VERIFIABLE with CREDIBLE SOURCES and DEVASTATING to opponents
-        - Use emotional appeals backed by HARD DATA and CITATIONS
-        - Make fence-sitters feel STUPID for not choosing your side
-        - This argument could be quoted in history books
-        - MANDATORY: Include source citations for all major claims using [Source: Name, Year] format
-        
-        The audience includes world leaders, scientists, economists, and skeptics.
-        WEAK ARGUMENTS OR MISSING SOURCES WILL BE DESTROYED. BRING YOUR A-GAME WITH PROOF.
-        """
-        
-        # Generate ultra-compelling arguments
-        pro_task = pro_agent.generate_argument(f"{ultra_enhanced_context}\n\nDEFEND WITH YOUR LIFE: {topic}")
-        con_task = con_agent.generate_argument(f"{ultra_enhanced_context}\n\nDESTROY THE CASE FOR: {topic}")
-        
-        pro_argument, con_argument = await asyncio.gather(pro_task, con_task)
-        
-        # Ultra-detailed mediator analysis
-        ultra_mediator_context = f"""
-        🏛 EXPERT ANALYSIS TRIBUNAL - FINAL JUDGMENT REQUIRED
-        
-        Topic: {topic}
-        Intensity Level: {intensity.upper()}
-        
-        PROSECUTION (PRO) PRESENTED:
-        {pro_argument}
-        
-        DEFENSE (CON) PRESENTED:
-        {con_argument}
-        
-        Distinguished analyst, the people demand TRUTH. Dissect every claim with forensic precision and present your analysis in comprehensive tabular format.
-        
-        MANDATORY TABULAR OUTPUT FORMAT:
-        
-        ## COMPREHENSIVE ARGUMENT ANALYSIS
-        
-        | Evaluation Criteria | Marcus Advocatus (PRO) | Gaius Contradictor (CON) | Analysis |
-        |-------------------|------------------------|---------------------------|-----------|
-        | **Primary Argument** | [Core thesis] | [Core thesis] | [Comparative strength] |
-        | **Evidence Quantity** | [# of sources/claims] | [# of sources/claims] | [Which has more support] |
-        | **Evidence Quality** | [Assessment + rating] | [Assessment + rating] | [Which is more credible] |
-        | **Logical Structure** | [Reasoning evaluation] | [Reasoning evaluation] | [Which flows better] |
-        | **Factual Accuracy** | [Verification status] | [Verification status] | [Which is more accurate] |
-        | **Source Credibility** | [Source assessment] | [Source assessment] | [Which uses better sources] |
-        | **Bias Detection** | [Identified biases] | [Identified biases] | [Which is more objective] |
-        | **Missing Context** | [What's not addressed] | [What's not addressed] | [Critical gaps] |
-        
-        ## DETAILED SOURCE VERIFICATION
-        | Claim | Side | Source | Credibility | Accuracy | Notes |
-        |-------|------|--------|-------------|----------|-------|
-        | [Specific claim 1] | PRO/CON | [Source name] | High/Med/Low | ✓/✗/?  | [Comments] |
-        | [Specific claim 2] | PRO/CON | [Source name] | High/Med/Low | ✓/✗/?  | [Comments] |
-        | [Specific claim 3] | PRO/CON | [Source name] | High/Med/Low | ✓/✗/?  | [Comments] |
-        
-        ## LOGICAL FALLACY DETECTION
-        | Fallacy Type | Marcus Advocatus | Gaius Contradictor | Impact |
-        |--------------|------------------|---------------------|---------|
-        | Appeal to Emotion | [Yes/No + example] | [Yes/No + example] | [Effect on argument] |
-        | Cherry Picking | [Yes/No + example] | [Yes/No + example] | [Effect on argument] |
-        | False Dichotomy | [Yes/No + example] | [Yes/No + example] | [Effect on argument] |
-        | Ad Hominem | [Yes/No + example] | [Yes/No + example] | [Effect on argument] |
-        
-        ## FINAL VERDICT
-        | Category | Winner | Score (1-10) | Justification |
-        |----------|---------|---------------|---------------|
-        | **Evidence Quality** | Marcus/Gaius/Tie | [Score] | [Detailed reasoning] |
-        | **Logical Rigor** | Marcus/Gaius/Tie | [Score] | [Detailed reasoning] |
-        | **Source Credibility** | Marcus/Gaius/Tie | [Score] | [Detailed reasoning] |
-        | **Factual Accuracy** | Marcus/Gaius/Tie | [Score] | [Detailed reasoning] |
-        | **Overall Winner** | Marcus/Gaius/Tie | [Total] | [Comprehensive analysis] |
-        
-        Provide thorough analysis within each cell while maintaining objectivity and precision.
-        """
-        
-        mediator_analysis = await mediator_agent.generate_argument(
-            "RENDER SUPREME JUDGMENT", 
-            ultra_mediator_context
-        )
-        
-        # Epic summary
-        summary = f"""🎯 EXPERT DEBATE ANALYSIS COMPLETE 🎯
-        
-        The world's leading experts have clashed over '{topic}' with devastating intellectual force.
-        
-        Marcus Advocatus wielded the power of progress and possibility.
-        Gaius Contradictor unleashed the reality of caution and consequence.
-        Lucius Moderator has weighed their arguments on the scales of truth.
-        
-        The floor falls silent. The decision is yours, but choose knowing that history will judge your wisdom.
-        
-        May evidence guide your decision. �"""
-        
-        return DebateResponse(
-            topic=topic,
-            pro_argument=pro_argument,
-            con_argument=con_argument,
-            mediator_analysis=mediator_analysis,
-            summary=summary
+        return await get_debate(
+            "intense", topic, intensity, resolve_mediator_mode(request.mediator_mode), request.reuse_similar
         )
         
+    except HTTPException:
+        raise
+    except DebateError as e:
+        raise HTTPException(status_code=503, detail=f"Debate generation failed: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+async def warm_up():
+    """Build the agents and open their connections in the background, ahead of the first debate"""
+    start = time.perf_counter()
+    loaded = await agents.load(*AGENT_NAMES)
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(None, agent.warm_up) for agent in loaded), return_exceptions=True
+    )
+    for agent, result in zip(loaded, results):
+        if isinstance(result, Exception):
+            # Not fatal: the first real call opens the connection instead
+            logger.warning("Warm-up of the %s agent failed: %s", agent.name, result)
+    logger.info("Agents warmed up in %.2fs", time.perf_counter() - start)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Debate job workers run alongside the API unless DEBATE_JOB_WORKERS=0 (then use app.worker)
+    await job_queue.start()
+    background = []
+    if AGENT_WARMUP:
+        background.append(asyncio.create_task(warm_up()))
+    if topic_index is not None:
+        background.append(asyncio.create_task(load_topic_index()))
+    yield
+    for task in background:
+        task.cancel()
+    await job_queue.stop()
+
+def create_app() -> FastAPI:
+    """Build the ASGI app; also usable as `uvicorn --factory app.main:create_app`"""
+    app = FastAPI(title="Vox Dualis - Ethical Debate Arena", version="1.0.0", lifespan=lifespan)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=FRONTEND_URLS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # BaseHTTPMiddleware wraps every response, streams included, so it is only installed when enabled
+    if SERVER_TIMING:
+        app.middleware("http")(add_server_timing)
+    app.include_router(router)
+    return app
+
+app = create_app()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # app.main uses relative imports, so run this from the backend directory as `python -m app.main`
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,173 @@
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# Prompt template registry. Templates are loaded once at startup from app/templates/*.txt
+# (optionally overridden by files in PROMPT_TEMPLATE_DIR) and compiled into static text
+# segments, so a request only splices in the topic and context instead of rebuilding
+# several kilobytes of f-strings.
+
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+# Rough estimate used for tracking prompt-token spend without an extra API call
+CHARS_PER_TOKEN = 4
+
+# $name is a placeholder and $$ is a literal "$". A "$" not followed by a name (e.g. "$5
+# trillion") is left as it is, so prose in an override file can't turn into a placeholder.
+PLACEHOLDER = re.compile(r"\$(?:(\$)|([A-Za-z_]\w*))")
+
+INTENSITY_MODIFIERS: Dict[str, Dict[str, str]] = {
+    "extreme": {
+        "urgency": "CIVILIZATION-DEFINING CRISIS",
+        "stakes": "The fate of humanity hangs in the balance",
+        "evidence_requirement": "Use SHOCKING statistics, Nobel Prize research, and world-changing examples",
+        "word_count": "400-500 words of devastating persuasion"
+    },
+    "high": {
+        "urgency": "CRITICAL DECISION POINT",
+        "stakes": "Millions of lives and billions of dollars at stake",
+        "evidence_requirement": "Use concrete data, peer-reviewed studies, and real case studies",
+        "word_count": "300-350 words of compelling evidence"
+    },
+    "medium": {
+        "urgency": "IMPORTANT CHOICE",
+        "stakes": "Significant consequences for society",
+        "evidence_requirement": "Use verified facts, expert opinions, and documented examples",
+        "word_count": "250-300 words of solid reasoning"
+    }
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, round(len(text) / CHARS_PER_TOKEN))
+
+
+class RenderedPrompt(NamedTuple):
+    name: str
+    text: str
+    chars: int
+    estimated_tokens: int
+
+
+class TokenUsage(NamedTuple):
+    """Token counts the model reported for one call"""
+    prompt: int
+    output: int
+
+
+Part = Union[str, Tuple[str]]
+
+
+def parse_template(text: str) -> List[Part]:
+    parts: List[Part] = []
+    position = 0
+    for match in PLACEHOLDER.finditer(text):
+        parts.append(text[position:match.start()] + (match.group(1) or ""))
+        if match.group(2):
+            parts.append((match.group(2),))
+        position = match.end()
+    parts.append(text[position:])
+    return parts
+
+
+class PromptTemplate:
+    """A template pre-split into static text and $placeholders"""
+
+    def __init__(self, name: str, parts: List[Part]):
+        self.name = name
+        # Adjacent static text is merged, so binding never costs extra joins per request
+        self.parts: List[Part] = []
+        for part in parts:
+            if isinstance(part, str) and self.parts and isinstance(self.parts[-1], str):
+                self.parts[-1] += part
+            elif part:
+                self.parts.append(part)
+        self.placeholders = {part[0] for part in self.parts if isinstance(part, tuple)}
+
+    @classmethod
+    def parse(cls, name: str, text: str) -> "PromptTemplate":
+        return cls(name, parse_template(text))
+
+    def bind(self, **static: str) -> "PromptTemplate":
+        """Fill in the per-agent/per-intensity values now, leaving the per-request ones.
+
+        Bound values are spliced in as static text and never parsed again, so a "$" inside
+        one is kept literally.
+        """
+        return PromptTemplate(self.name, [
+            static.get(part[0], part) if isinstance(part, tuple) else part
+            for part in self.parts
+        ])
+
+    def __add__(self, other: Union["PromptTemplate", str]) -> "PromptTemplate":
+        parts = other.parts if isinstance(other, PromptTemplate) else [other]
+        return PromptTemplate(self.name, self.parts + parts)
+
+    def render(self, **values: str) -> RenderedPrompt:
+        missing = self.placeholders - values.keys()
+        if missing:
+            raise KeyError(f"Prompt template '{self.name}' is missing values for: {', '.join(sorted(missing))}")
+        text = "".join(values[part[0]] if isinstance(part, tuple) else part for part in self.parts)
+        return RenderedPrompt(self.name, text, len(text), estimate_tokens(text))
+
+
+class PromptRegistry:
+    def __init__(self, override_dir: Optional[str] = None):
+        sources: Dict[str, str] = {}
+        for directory in filter(None, [DEFAULT_TEMPLATE_DIR, override_dir]):
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith(".txt"):
+                    with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                        sources[filename[:-4]] = f.read().strip("\n")
+        self.templates = {name: PromptTemplate.parse(name, text) for name, text in sources.items()}
+        self.bound: Dict[Tuple[str, str], PromptTemplate] = {}
+        self.usage: Dict[str, Dict[str, int]] = {}
+        self.lock = threading.Lock()
+        self._precompile()
+
+    def _precompile(self):
+        # Debater prompts: briefing + side instruction, per intensity. The leading newline
+        # keeps the briefing on its own lines after "DEBATE TOPIC:" in the agent template.
+        for side in ("pro", "con"):
+            self.bound[(side, "standard")] = (
+                PromptTemplate(side, ["\n"]) + self.templates["debate_briefing"] + "\n\n"
+                + self.templates[f"debate_{side}"]
+            )
+            for intensity, modifier in INTENSITY_MODIFIERS.items():
+                self.bound[(side, intensity)] = (
+                    PromptTemplate(side, ["\n"]) + self.templates["intense_briefing"].bind(**modifier) + "\n\n"
+                    + self.templates[f"intense_{side}"]
+                )
+
+    def text(self, name: str) -> str:
+        """A template without placeholders, as plain text"""
+        return self.templates[name].render().text
+
+    def template(self, name: str) -> PromptTemplate:
+        return self.templates[name]
+
+    def bind(self, name: str, key: str, **static: str) -> PromptTemplate:
+        """Compile `name` with `static` values once and reuse it for every request under `key`"""
+        bound = self.bound.get((name, key))
+        if bound is None:
+            bound = self.templates[name].bind(**static)
+            self.bound[(name, key)] = bound
+        return bound
+
+    def debater(self, side: str, intensity: Optional[str]) -> PromptTemplate:
+        # Unknown intensities fall back to "high", as the endpoint always has
+        if intensity is None:
+            return self.bound[(side, "standard")]
+        return self.bound.get((side, intensity), self.bound[(side, "high")])
+
+    def record(self, prompt: RenderedPrompt):
+        with self.lock:
+            usage = self.usage.setdefault(prompt.name, {"calls": 0, "chars": 0, "estimated_tokens": 0})
+            usage["calls"] += 1
+            usage["chars"] += prompt.chars
+            usage["estimated_tokens"] += prompt.estimated_tokens
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            return {name: dict(usage) for name, usage in self.usage.items()}
@@ -0,0 +1,161 @@
+import asyncio
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+# Resilience layer under DebateAgent: deadlines, jittered backoff on 429/5xx,
+# a token bucket per API key and a circuit breaker that fails fast when Gemini is down.
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class AgentError(Exception):
+    """An agent could not produce an argument; raised instead of returning error text"""
+
+    def __init__(self, role: str, message: str):
+        super().__init__(f"{role}: {message}")
+        self.role = role
+        self.message = message
+
+
+class CircuitOpenError(AgentError):
+    pass
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, with bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and lets one probe through after `reset_timeout`"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "half-open":
+            # Let a single probe through; it either closes the circuit or re-opens it
+            self.opened_at = time.monotonic()
+            return True
+        return state == "closed"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    # Looked up rather than imported so the app can start without loading the SDK; until it is
+    # loaded, no error can be one of its exceptions
+    api_exceptions = sys.modules.get("google.api_core.exceptions")
+    if api_exceptions is not None and isinstance(error, api_exceptions.GoogleAPICallError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    # "Full jitter" exponential backoff
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class ResiliencePolicy:
+    def __init__(
+        self,
+        timeout: float = 60,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 20.0,
+        rate_per_minute: float = 15,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_per_minute = rate_per_minute
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def make_limiter(self) -> TokenBucket:
+        return TokenBucket(rate=self.rate_per_minute / 60, capacity=max(1, self.rate_per_minute / 4))
+
+    def make_breaker(self) -> CircuitBreaker:
+        return CircuitBreaker(self.failure_threshold, self.reset_timeout)
+
+
+async def call_with_resilience(
+    role: str,
+    call: Callable[[], Awaitable[T]],
+    policy: ResiliencePolicy,
+    limiter: TokenBucket,
+    breaker: CircuitBreaker,
+    timeout: Optional[float] = None,
+) -> T:
+    """Run `call` under the per-key limiter and breaker, retrying 429/5xx/timeouts with backoff.
+
+    Each attempt gets `timeout` seconds (default: the policy's timeout).
+    """
+    timeout = policy.timeout if timeout is None else timeout
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(role, "upstream unavailable (circuit open), failing fast")
+        await limiter.acquire()
+        try:
+            result = await asyncio.wait_for(call(), timeout=timeout)
+        except Exception as e:
+            retryable = is_retryable(e)
+            if retryable:
+                # Only upstream trouble counts towards opening the circuit, not e.g. a blocked prompt
+                breaker.record_failure()
+            if not retryable or attempt >= policy.max_retries:
+                reason = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                raise AgentError(role, f"generation failed after {attempt + 1} attempt(s): {reason}") from e
+            await asyncio.sleep(backoff_delay(attempt, policy.backoff_base, policy.backoff_max))
+            attempt += 1
+        else:
+            breaker.record_success()
+            return result
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Tuple
+
+from .prompts import PromptRegistry, estimate_tokens
+from .resilience import AgentError
+
+# Multi-round debates: opening, rebuttals, conclusion.
+# Each turn sees a digest of its own and its opponent's previous turn instead of the growing
+# transcript, so a round's prompt stays roughly the same size however many rounds came before.
+
+OPPONENTS = {"pro": "con", "con": "pro"}
+SIDE_LABELS = {"pro": "FOR", "con": "AGAINST"}
+
+
+def stage_for(round_number: int, rounds: int) -> str:
+    if round_number == 1:
+        return "opening"
+    if round_number == rounds:
+        return "conclusion"
+    return "rebuttal"
+
+
+class TurnError(Exception):
+    """A side failed its turn, so the debate cannot go on"""
+
+    def __init__(self, round_number: int, role: str, error: AgentError):
+        super().__init__(str(error))
+        self.round = round_number
+        self.role = role
+
+
+class Turn(NamedTuple):
+    round: int
+    stage: str
+    role: str
+    text: str
+    seconds: float
+    prompt_tokens: int
+    output_tokens: int
+
+
+class RoundResult(NamedTuple):
+    round: int
+    stage: str
+    seconds: float
+    turns: Dict[str, Turn]
+
+
+class MultiRoundDebate:
+    """Runs pro and con (DebateAgent-like: build_prompt and generate_routed) through a number of rounds"""
+
+    def __init__(
+        self,
+        topic: str,
+        agents: Dict[str, Any],
+        registry: PromptRegistry,
+        opening: Dict[str, str],
+        digest: Callable[[str], str],
+        rounds: int = 3,
+    ):
+        self.topic = topic
+        self.agents = agents
+        self.registry = registry
+        self.opening = opening
+        self.digest = digest
+        self.rounds = rounds
+        # Rolling per-side state: a digest of each side's latest turn
+        self.digests: Dict[str, str] = {}
+        self.results: List[RoundResult] = []
+
+    def build_turn_prompt(self, round_number: int, role: str):
+        agent = self.agents[role]
+        if round_number == 1:
+            return agent.build_prompt(self.opening[role])
+        stage = stage_for(round_number, self.rounds)
+        task = self.registry.template(f"round_{stage}").render(
+            topic=self.topic, side=SIDE_LABELS[role], round=str(round_number), rounds=str(self.rounds)
+        )
+        context = self.registry.template("round_context").render(
+            own_turn=self.digests[role], opponent_turn=self.digests[OPPONENTS[role]]
+        )
+        return agent.build_prompt(task.text, context.text)
+
+    async def take_turn(self, round_number: int, role: str) -> Turn:
+        prompt = self.build_turn_prompt(round_number, role)
+        start = time.perf_counter()
+        try:
+            text, _, usage = await self.agents[role].generate_routed(prompt)
+        except AgentError as e:
+            raise TurnError(round_number, role, e) from e
+        # Counts are the model's own where it reports usage, estimated from the text otherwise
+        return Turn(
+            round=round_number,
+            stage=stage_for(round_number, self.rounds),
+            role=role,
+            text=text,
+            seconds=time.perf_counter() - start,
+            prompt_tokens=usage.prompt if usage else prompt.estimated_tokens,
+            output_tokens=usage.output if usage else estimate_tokens(text),
+        )
+
+    async def run(self) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield ("turn", Turn) as each side finishes and ("round", RoundResult) as each round completes.
+
+        Raises TurnError if a side fails; the debate cannot continue without its turn.
+        """
+        for round_number in range(1, self.rounds + 1):
+            start = time.perf_counter()
+            # Both sides answer the other's previous turn, so they can run concurrently
+            tasks = [asyncio.create_task(self.take_turn(round_number, role)) for role in OPPONENTS]
+            turns: Dict[str, Turn] = {}
+            try:
+                for next_turn in asyncio.as_completed(tasks):
+                    turn = await next_turn
+                    turns[turn.role] = turn
+                    yield "turn", turn
+            finally:
+                for task in tasks:
+                    task.cancel()
+            # Digest after the round so neither side sees the other's same-round reply
+            for role, turn in turns.items():
+                self.digests[role] = self.digest(turn.text)
+            result = RoundResult(round_number, stage_for(round_number, self.rounds), time.perf_counter() - start, turns)
+            self.results.append(result)
+            yield "round", result
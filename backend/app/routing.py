@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, NamedTuple, Optional, Tuple
+
+from .resilience import is_retryable
+
+# Per-role model routing: a primary model, ordered fallbacks and optional hedged requests.
+# A hedge fires a second call (to the next model in the route, or the same model again) once the
+# first has been outstanding longer than a latency percentile, keeps whichever answers first and
+# cancels the other. The SDK call itself is blocking, so a cancelled loser still finishes on its
+# executor thread; only its result is discarded.
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+# Hedge on the configured minimum delay until a model has this many latency samples
+MIN_HEDGE_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+ModelCall = Callable[[Any], Awaitable[Any]]
+# Awaited before each upstream call beyond the first (a hedge or a fallback), e.g. to take a rate limit slot
+BeforeCall = Optional[Callable[[], Awaitable[None]]]
+
+
+def parse_models(value: str) -> Tuple[str, ...]:
+    models = tuple(model.strip() for model in value.split(",") if model.strip())
+    return models or (DEFAULT_MODEL,)
+
+
+class RouteConfig(NamedTuple):
+    models: Tuple[str, ...]  # primary first, then fallbacks in order
+    hedge_percentile: float = 0  # 0 disables hedging
+    hedge_min_delay: float = 2.0
+
+
+class Served(NamedTuple):
+    model: str
+    route: str  # primary, fallback or hedge
+
+
+class LatencyWindow:
+    """Recent call durations for one model: successes, plus calls abandoned or timed out while still running"""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if len(self.samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class ModelRouter:
+    def __init__(self, config: RouteConfig, make_model: Callable[[str], Any], timeout: Optional[float] = None):
+        self.config = config
+        # Deadline for each model attempt, so a primary that times out still leaves time for its fallbacks
+        self.timeout = timeout
+        self.models: Dict[str, Any] = {name: make_model(name) for name in config.models}
+        self.latency = {name: LatencyWindow() for name in config.models}
+        self.served: Dict[Served, int] = {}
+
+    @property
+    def primary(self) -> str:
+        return self.config.models[0]
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Time to allow a whole call down the route: one attempt's deadline per model, plus the hedge delay
+        for each, as a hedge fired just before the first call's deadline gets a full deadline of its own"""
+        if self.timeout is None:
+            return None
+        return sum(self.timeout + (self.hedge_delay(model) or 0) for model in self.config.models)
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        if not self.config.hedge_percentile:
+            return None
+        observed = self.latency[model].percentile(self.config.hedge_percentile)
+        return max(self.config.hedge_min_delay, observed or 0)
+
+    async def _timed(self, model: str, call: ModelCall) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call(self.models[model]), timeout=self.timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # Censored sample: the call took at least this long. Leaving out hedge losers and timeouts would
+            # keep only the fast calls in the window and drag the hedge delay down.
+            self.latency[model].observe(time.perf_counter() - start)
+            raise
+        self.latency[model].observe(time.perf_counter() - start)
+        return result
+
+    async def _hedged(
+        self, model: str, alternate: str, call: ModelCall, before_call: BeforeCall
+    ) -> Tuple[Any, str, bool]:
+        """Call `model`, racing `alternate` against it if it is slow; returns (result, model, hedged)"""
+        first = asyncio.ensure_future(self._timed(model, call))
+        delay = self.hedge_delay(model)
+        if delay is None:
+            return await first, model, False
+        tasks = {first: model}
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result(), model, False
+            if before_call is not None:
+                await before_call()
+                if first.done() and first.exception() is None:
+                    return first.result(), model, False
+            second = asyncio.ensure_future(self._timed(alternate, call))
+            tasks[second] = alternate
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), tasks[task], task is second
+                    error = task.exception()
+            raise error
+        finally:
+            # Whichever call lost (or both, if we were cancelled) is abandoned
+            for task in tasks:
+                task.cancel()
+
+    async def call(self, call: ModelCall, before_call: BeforeCall = None) -> Tuple[Any, Served]:
+        """Run `call(model)` down the route, hedging if configured; raises the last error if every model fails.
+
+        `before_call` runs before every hedge and fallback, as each is another upstream request.
+        """
+        models = self.config.models
+        for i, model in enumerate(models):
+            alternate = models[i + 1] if i + 1 < len(models) else model
+            if i > 0 and before_call is not None:
+                await before_call()
+            try:
+                result, served_by, hedged = await self._hedged(model, alternate, call, before_call)
+            except Exception as e:
+                # Only upstream trouble is worth another model; a rejected prompt would fail everywhere
+                if not is_retryable(e) or i == len(models) - 1:
+                    raise
+                continue
+            served = Served(served_by, "hedge" if hedged else "primary" if i == 0 else "fallback")
+            self.served[served] = self.served.get(served, 0) + 1
+            return result, served
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "models": list(self.config.models),
+            "hedge_percentile": self.config.hedge_percentile,
+            "hedge_delay": {model: self.hedge_delay(model) for model in self.config.models},
+            "served": {f"{served.model}/{served.route}": count for served, count in sorted(self.served.items())},
+        }
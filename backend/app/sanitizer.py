@@ -0,0 +1,49 @@
+import re
+
+# Maps the HTML tags Gemini sometimes emits despite the prompt to markdown, in one linear pass.
+# Matches any case and attributes (<BR>, <br />, <b class="x">), but not e.g. <blockquote>. Attributes must
+# be name=value pairs, so prose comparisons like "x<b and y>5" or "p<i and q>r" are left alone; only prose
+# that happens to read as one ("a<b c=d>e") is still taken for a tag.
+
+TAG_REPLACEMENTS = {
+    "br": "\n",
+    "b": "**",
+    "strong": "**",
+    "i": "_",
+    "em": "_",
+}
+
+TAG_PATTERN = re.compile(
+    r"</?(br|b|strong|i|em)(?:\s+[\w:-]+\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s>]+))*\s*/?>", re.IGNORECASE
+)
+
+# A '<' further back than this from the end of a chunk can't be the start of a tag we map
+MAX_TAG_LENGTH = 64
+
+
+def _replace(match: "re.Match") -> str:
+    return TAG_REPLACEMENTS[match.group(1).lower()]
+
+
+def sanitize(text: str) -> str:
+    return TAG_PATTERN.sub(_replace, text)
+
+
+class StreamSanitizer:
+    """Sanitizes streamed chunks, holding back a possible tag split across a chunk boundary"""
+
+    def __init__(self):
+        self.pending = ""
+
+    def feed(self, chunk: str) -> str:
+        text = self.pending + chunk
+        start = text.rfind("<")
+        if start != -1 and ">" not in text[start:] and len(text) - start <= MAX_TAG_LENGTH:
+            text, self.pending = text[:start], text[start:]
+        else:
+            self.pending = ""
+        return sanitize(text)
+
+    def flush(self) -> str:
+        text, self.pending = self.pending, ""
+        return sanitize(text)
@@ -0,0 +1,270 @@
+import hashlib
+import re
+import zlib
+from array import array
+from collections import Counter
+import struct
+import sys
+import threading
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
+
+# Near-duplicate topic index: "Should AI be regulated?" and "Is regulating AI a good idea?" should
+# find the same archived debate. Topics are reduced to content words (stopwords and debate framing
+# dropped, light stemming), turned into character n-grams and indexed with MinHash + LSH banding,
+# so a lookup hashes one short string and checks a handful of buckets however many topics are stored.
+# Everything is local; no embedding service is involved.
+
+WORD = re.compile(r"[a-z0-9]+")
+
+# Function words plus the framing debaters put around a topic
+STOPWORDS = frozenset(
+    "a an the and or of to in on for with by as at from into about than then that this these those "
+    "is are was were be been being am do does did done have has had it its it's we you they i our their "
+    "should would could can may might must shall will ever really truly "
+    "what which who whom whose why how when where whether if "
+    "idea okay ok".split()
+)
+# "Is regulating AI a good idea?" asks the same as "Should AI be regulated?", and "a bad idea" the opposite
+FRAMING = (("good idea", " "), ("bad idea", " not "))
+# "Should AI be regulated" and "should AI not be regulated" are different debates however similar
+# the wording, so negated topics are only ever compared with negated ones
+NEGATIONS = frozenset("not no never without nor against".split())
+SUFFIXES = ("ations", "ation", "ings", "ing", "ies", "ied", "es", "ed", "ly", "s")
+
+
+def stem(word: str) -> str:
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def root(word: str) -> str:
+    # A coarser stem for the short list below, so "increase", "increased" and "increasing" agree
+    return stem(word).rstrip("e")
+
+
+# Words that set which way a topic leans. "Is social media good for teenagers?" and "...bad for teenagers?"
+# differ in one short word, so like negations they partition the index instead of just lowering the score.
+POLARITY = frozenset(
+    root(word) for word in
+    "good bad harmful beneficial helpful dangerous safe pro anti "
+    "raise lower increase decrease cut boost reduce expand limit".split()
+)
+# Comparisons also depend on word order: "Is nuclear power better than solar?" is not
+# "Is solar power better than nuclear?", so what comes before the comparison is part of the partition
+COMPARATIVES = frozenset(
+    root(word) for word in "better worse more less higher greater fewer superior inferior best worst most least".split()
+)
+
+SHINGLE_SIZE = 3
+
+# Past this many LSH candidates (a dense cluster of similar topics), only those sharing at least
+# two bands are checked. That skips most topics well below the threshold and, with the default
+# layout, still finds over 94% of pairs right at it and effectively all of them from 0.9 up.
+MAX_SINGLE_BAND_CANDIDATES = 64
+
+
+def topic_words(topic: str) -> List[str]:
+    text = " " + topic.lower().replace("'", "") + " "
+    for phrase, replacement in FRAMING:
+        text = text.replace(f" {phrase}", replacement)
+    return WORD.findall(text)
+
+
+def topic_terms(topic: str) -> List[str]:
+    """Content words of a topic, stemmed and sorted so word order does not matter"""
+    words = topic_words(topic)
+    terms = {stem(word) for word in words if word not in STOPWORDS}
+    # A topic made only of stopwords still needs some terms to compare on
+    return sorted(terms or set(words))
+
+
+def topic_partition(topic: str) -> str:
+    """What a topic must share with another to be compared at all: negation, polarity and comparisons.
+
+    "not|good" for "Is social media not good for teenagers?", "nuclear power>better" for
+    "Is nuclear power better than solar?", "" for a plain topic.
+    """
+    words = topic_words(topic)
+    parts = []
+    for i, word in enumerate(words):
+        term = root(word)
+        if term in COMPARATIVES:
+            subject = sorted({stem(w) for w in words[:i] if w not in STOPWORDS and root(w) not in COMPARATIVES})
+            parts.append(f"{' '.join(subject)}>{term}")
+        elif term in POLARITY:
+            parts.append(term)
+    if any(word in NEGATIONS for word in words):
+        parts.append("not")
+    return "|".join(sorted(set(parts)))
+
+
+def shingles(topic: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """Character n-grams of each term, padded so short terms and word edges count"""
+    grams = set()
+    for term in topic_terms(topic):
+        padded = f" {term} "
+        grams.update(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+    return frozenset(grams)
+
+
+@lru_cache(maxsize=1 << 16)
+def gram_hashes(gram: str, num_perm: int) -> Tuple[int, ...]:
+    """num_perm independent 32-bit hashes of one n-gram.
+
+    Topics share a small vocabulary of n-grams, so these are nearly always cached and a signature
+    costs one min() per column instead of num_perm modular hashes per n-gram.
+    """
+    data = gram.encode()
+    # Each 64-byte blake2b digest yields 16 hashes
+    digest = b"".join(
+        hashlib.blake2b(data, digest_size=64, person=i.to_bytes(1, "little")).digest()
+        for i in range(-(-num_perm // 16))
+    )
+    return struct.unpack_from(f"<{num_perm}I", digest)
+
+
+def gram_checksums(grams: FrozenSet[str]) -> FrozenSet[int]:
+    return frozenset(zlib.crc32(gram.encode()) for gram in grams)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def topic_similarity(a: str, b: str) -> float:
+    """What the index scores a pair of topics: n-gram Jaccard, and 0 unless they lean the same way"""
+    if topic_partition(a) != topic_partition(b):
+        return 0.0
+    return jaccard(shingles(a), shingles(b))
+
+
+def band_layout(threshold: float, rows: int = 5, recall: float = 0.99) -> int:
+    """Fewest LSH bands of `rows` hashes that find a pair at `threshold` similarity with probability `recall`.
+
+    Every band is one dict entry per indexed topic, so fewer bands keep the index small; the
+    candidates they let through below the threshold are filtered by the exact similarity.
+    """
+    bands = 1
+    while 1 - (1 - threshold ** rows) ** bands < recall:
+        bands += 1
+    return bands
+
+
+class Match(NamedTuple):
+    key: str
+    topic: str
+    score: float  # Jaccard similarity of the topics' n-grams
+
+
+class TopicIndex:
+    """Incremental MinHash/LSH index of topics; each entry has a key (e.g. an archive id) and a scope"""
+
+    def __init__(self, threshold: float = 0.8, rows: int = 5):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.rows = rows
+        self.bands = band_layout(threshold, rows)
+        self.num_perm = self.bands * rows
+        # Entries are positions in these lists. Signatures are not kept, only band hashes and a compact
+        # array of n-gram checksums to compute the exact similarity of LSH candidates.
+        self.keys: List[str] = []
+        self.topics: List[str] = []
+        self.scopes: List[str] = []
+        self.grams: List[array] = []
+        self.positions: Dict[str, int] = {}
+        # Per band: hash of (scope, band) -> position, or a list of positions once several share it
+        self.buckets: List[Dict[int, Union[int, List[int]]]] = [{} for _ in range(self.bands)]
+        self.lock = threading.Lock()
+        self.lookups = 0
+        self.matches = 0
+
+    def signature(self, grams: FrozenSet[str]) -> List[int]:
+        if not grams:
+            return [0] * self.num_perm
+        return [min(column) for column in zip(*(gram_hashes(gram, self.num_perm) for gram in grams))]
+
+    def _locate(self, topic: str, scope: str) -> Tuple[str, FrozenSet[str], List[int]]:
+        grams = shingles(topic)
+        # Negated, polar and comparative topics live in their own partitions of every bucket table
+        partition = topic_partition(topic)
+        if partition:
+            scope = f"{scope}|{partition}"
+        signature = self.signature(grams)
+        rows = self.rows
+        bands = [hash((scope, *signature[i * rows:(i + 1) * rows])) for i in range(self.bands)]
+        return sys.intern(scope), grams, bands
+
+    def add(self, key: str, topic: str, scope: str = ""):
+        """Index a topic under `key`; re-adding a known key is a no-op"""
+        if key in self.positions:
+            return
+        scope, grams, bands = self._locate(topic, scope)
+        checksums = array("I", sorted(gram_checksums(grams)))
+        with self.lock:
+            if key in self.positions:
+                return
+            position = len(self.keys)
+            self.keys.append(key)
+            self.topics.append(topic)
+            self.scopes.append(scope)
+            self.grams.append(checksums)
+            self.positions[key] = position
+            for buckets, band in zip(self.buckets, bands):
+                known = buckets.get(band)
+                if known is None:
+                    buckets[band] = position
+                elif isinstance(known, list):
+                    known.append(position)
+                else:
+                    buckets[band] = [known, position]
+
+    def query(self, topic: str, scope: str = "", threshold: Optional[float] = None, limit: int = 5) -> List[Match]:
+        """Indexed topics in `scope` at least `threshold` similar to `topic`, best first"""
+        threshold = self.threshold if threshold is None else threshold
+        scope, grams, bands = self._locate(topic, scope)
+        collisions: Counter = Counter()
+        with self.lock:
+            for buckets, band in zip(self.buckets, bands):
+                known = buckets.get(band)
+                if known is None:
+                    continue
+                if isinstance(known, list):
+                    collisions.update(known)
+                else:
+                    collisions[known] += 1
+            if len(collisions) > MAX_SINGLE_BAND_CANDIDATES:
+                candidates = [i for i, count in collisions.items() if count > 1]
+            else:
+                candidates = list(collisions)
+            entries = [i for i in candidates if self.scopes[i] == scope]
+        # LSH only proposes candidates; the exact similarity decides
+        checksums = gram_checksums(grams)
+        matches = []
+        for i in entries:
+            shared = len(checksums.intersection(self.grams[i]))
+            score = shared / (len(checksums) + len(self.grams[i]) - shared) if shared else 0.0
+            if score >= threshold:
+                matches.append(Match(self.keys[i], self.topics[i], score))
+        matches.sort(key=lambda match: -match.score)
+        self.lookups += 1
+        self.matches += bool(matches)
+        return matches[:limit]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "topics": len(self.keys),
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows": self.rows,
+            "lookups": self.lookups,
+            "matches": self.matches,
+        }
@@ -0,0 +1,15 @@
+import asyncio
+
+from .config import Env
+from .main import job_queue
+
+# Standalone debate job worker sharing DEBATE_JOBS_PATH with the API.
+# Run the API with DEBATE_JOB_WORKERS=0 and start this from the backend directory:
+#
+#     python -m app.worker
+
+if __name__ == "__main__":
+    env = Env()
+    job_queue.workers = env.get_int("DEBATE_WORKER_CONCURRENCY", 2, minimum=1)
+    env.check()
+    asyncio.run(job_queue.run_forever())
@@ -0,0 +1,78 @@
+"""Compare the single-pass sanitizer with the old chain of str.replace calls.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_sanitizer
+"""
+import random
+import timeit
+
+from app.sanitizer import StreamSanitizer, sanitize
+
+WORDS = (
+    "policy evidence regulation growth risk innovation market study public data cost benefit "
+    "economy society research impact report global trend future outcome workers citizens"
+).split()
+TAGS = ["<br>", "<br/>", "<br />", "<b>", "</b>", "<strong>", "</strong>", "<em>", "</em>", "<i>", "</i>"]
+
+
+def legacy_clean(text: str) -> str:
+    # The chain DebateAgent.generate_argument used before app/sanitizer.py
+    text = text.replace('<br>', '\n')
+    text = text.replace('<br/>', '\n')
+    text = text.replace('<br />', '\n')
+    text = text.replace('<b>', '**')
+    text = text.replace('</b>', '**')
+    text = text.replace('<i>', '_')
+    text = text.replace('</i>', '_')
+    text = text.replace('<strong>', '**')
+    text = text.replace('</strong>', '**')
+    text = text.replace('<em>', '_')
+    text = text.replace('</em>', '_')
+    return text
+
+
+def make_argument(rng: random.Random, words: int) -> str:
+    # A 300-500 word argument with citations and an occasional stray tag, like real model output
+    parts = []
+    for i in range(words):
+        parts.append(rng.choice(WORDS))
+        if i % 40 == 39:
+            parts.append(f"[Source: {rng.choice(['World Bank', 'IMF', 'Nature', 'OECD'])}, {rng.randint(2000, 2024)}]")
+        if rng.random() < 0.02:
+            parts.append(rng.choice(TAGS))
+    return " ".join(parts)
+
+
+def main():
+    rng = random.Random(42)
+    samples = [make_argument(rng, rng.randint(300, 500)) for _ in range(200)]
+    rounds = 20
+
+    def run_legacy():
+        for sample in samples:
+            legacy_clean(sample)
+
+    def run_single_pass():
+        for sample in samples:
+            sanitize(sample)
+
+    def run_streaming():
+        for sample in samples:
+            sanitizer = StreamSanitizer()
+            for i in range(0, len(sample), 80):
+                sanitizer.feed(sample[i:i + 80])
+            sanitizer.flush()
+
+    results = {
+        "legacy str.replace chain": min(timeit.repeat(run_legacy, number=rounds, repeat=5)),
+        "single-pass sanitize": min(timeit.repeat(run_single_pass, number=rounds, repeat=5)),
+        "streaming (80-char chunks)": min(timeit.repeat(run_streaming, number=rounds, repeat=5)),
+    }
+    per_call = rounds * len(samples)
+    for name, seconds in results.items():
+        print(f"{name:28s} {seconds / per_call * 1e6:8.2f} us/argument")
+
+
+if __name__ == "__main__":
+    main()
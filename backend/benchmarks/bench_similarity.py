@@ -0,0 +1,95 @@
+"""Near-duplicate topic index: lookup latency at scale and how well paraphrases are found.
+
+Fills the index with synthetic topics, then times lookups for paraphrases of indexed topics and
+for unrelated topics. Run from the backend directory:
+
+    python -m benchmarks.bench_similarity --topics 100000
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from app.similarity import TopicIndex, topic_similarity
+
+SUBJECTS = (
+    "artificial intelligence", "nuclear power", "social media", "universal basic income", "remote work",
+    "genetic engineering", "cryptocurrency", "space exploration", "school uniforms", "animal testing",
+    "self-driving cars", "fast fashion", "standardized testing", "video games", "facial recognition",
+)
+FRAMES = ("Should {} be {}?", "Is it a good idea for {} to be {}?", "{} should be {}", "Ought {} to be {}?")
+ACTIONS = ("regulated", "banned", "subsidized", "taxed", "encouraged", "restricted", "made mandatory")
+# Paraphrase pairs expected to match, and look-alikes that must not
+PARAPHRASES = [
+    ("Should AI be regulated?", "Is regulating AI a good idea?"),
+    ("Should AI be regulated?", "should ai be regulated"),
+    ("Is nuclear power the answer to climate change?", "Is nuclear power the answer to the climate change?"),
+    ("Should social media be banned for kids?", "Should social media be banned for kids"),
+]
+DISTINCT = [
+    ("Should AI be regulated?", "Should AI not be regulated?"),
+    ("Should AI be regulated?", "Should crypto be regulated?"),
+    ("Should AI be regulated?", "Is regulating AI a bad idea?"),
+    ("Is social media good for teenagers?", "Is social media bad for teenagers?"),
+    ("Is nuclear power better than solar?", "Is solar power better than nuclear?"),
+    ("Should taxes be raised?", "Should taxes be lowered?"),
+]
+
+
+def synthetic_topic(rng: random.Random, i: int) -> str:
+    # Invented words keep topics distinct, with a familiar subject in some of them so the
+    # index also sees clusters of topics that share most of their words
+    words = [
+        "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+        for _ in range(rng.randint(2, 3))
+    ]
+    if rng.random() < 0.3:
+        words[0] = rng.choice(SUBJECTS)
+    return rng.choice(FRAMES).format(" ".join(words), rng.choice(ACTIONS))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    index = TopicIndex(threshold=args.threshold)
+    topics = [synthetic_topic(rng, i) for i in range(args.topics)]
+    start = time.perf_counter()
+    for i, topic in enumerate(topics):
+        index.add(str(i), topic)
+    elapsed = time.perf_counter() - start
+    print(f"indexed {len(index)} topics in {elapsed:.1f}s ({len(index) / elapsed:,.0f}/s), "
+          f"{index.bands} bands x {index.rows} rows")
+
+    for label, queries in (
+        ("indexed topics", [rng.choice(topics) for _ in range(args.lookups)]),
+        ("unseen topics", [synthetic_topic(rng, args.topics + i) for i in range(args.lookups)]),
+    ):
+        timings = []
+        found = 0
+        for query in queries:
+            start = time.perf_counter()
+            found += bool(index.query(query))
+            timings.append(time.perf_counter() - start)
+        print(f"{label:15s} p50 {percentile(timings, 50) * 1000:.3f}ms  p99 {percentile(timings, 99) * 1000:.3f}ms  "
+              f"matched {found / len(queries):.0%}")
+
+    print("\nparaphrases (should match):")
+    for a, b in PARAPHRASES:
+        print(f"  {topic_similarity(a, b):.2f}  {a!r} ~ {b!r}")
+    print("look-alikes (should not):")
+    for a, b in DISTINCT:
+        print(f"  {topic_similarity(a, b):.2f}  {a!r} ~ {b!r}")
+
+
+if __name__ == "__main__":
+    main()
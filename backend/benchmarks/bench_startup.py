@@ -0,0 +1,88 @@
+"""Cold-start benchmark: how long importing the app and serving its first requests takes.
+
+Each run is a fresh interpreter, so nothing is warm from an earlier run. It times `import app.main`,
+the first GET /health and the first POST /debate, which builds the agents (and loads the Gemini SDK)
+against a fake backend. Run from the backend directory:
+
+    python -m benchmarks.bench_startup --runs 7 --output startup.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.load_test import asgi_request
+
+METRICS = ["import_s", "first_health_s", "first_debate_s"]
+
+
+async def first_requests(main) -> Dict[str, float]:
+    health = await asgi_request(main.app, "GET", "/health", {})
+    debate = await asgi_request(main.app, "POST", "/debate", {"topic": "Should AI be regulated?"})
+    if debate["status"] != 200:
+        raise RuntimeError(f"/debate returned {debate['status']}")
+    return {"first_health_s": health["latency"], "first_debate_s": debate["latency"]}
+
+
+def child():
+    """One cold start; prints its timings as a JSON line"""
+    os.environ.setdefault("DEBATE_CACHE_BACKEND", "off")
+    os.environ.setdefault("DEBATE_JOB_WORKERS", "0")
+    os.environ.setdefault("AGENT_RATE_LIMIT_RPM", "0")
+    start = time.perf_counter()
+    from app import main
+    imported = time.perf_counter() - start
+    sdk_at_import = "google.generativeai" in sys.modules
+
+    from benchmarks.fake_gemini import FakeGeminiModel
+
+    # Near-instant fake generations, so the first debate measures setup rather than the model
+    main.DebateAgent.make_model = lambda self, name: FakeGeminiModel(median_latency=0.001, time_to_first_chunk=0)
+    result = {"import_s": imported, "sdk_loaded_at_import": sdk_at_import}
+    result.update(asyncio.run(first_requests(main)))
+    print(json.dumps(result))
+
+
+def run(args) -> Dict[str, object]:
+    runs: List[Dict[str, object]] = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    results = {f"{metric}_median": statistics.median(r[metric] for r in runs) for metric in METRICS}
+    results.update({f"{metric}_max": max(r[metric] for r in runs) for metric in METRICS})
+    results["sdk_loaded_at_import"] = any(r["sdk_loaded_at_import"] for r in runs)
+    return {"config": {"runs": args.runs}, "results": results, "runs": runs}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        child()
+        return
+    report = run(args)
+    json.dump(report["results"], sys.stdout, indent=2, sort_keys=True)
+    print()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
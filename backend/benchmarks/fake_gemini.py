@@ -0,0 +1,124 @@
+"""Local stand-in for google.generativeai.GenerativeModel, for benchmarks that must not spend quota.
+
+It mimics the parts of the SDK that DebateAgent uses: generate_content(prompt, stream=..., request_options=...)
+returning objects with .text and .usage_metadata, blocking for a sampled latency like the real call does.
+"""
+import random
+import threading
+import time
+from typing import Iterator, List, Optional
+
+from google.api_core import exceptions as api_exceptions
+
+PHRASES = [
+    "the evidence from three decades of policy experiments is unambiguous",
+    "independent audits found measurable gains in both productivity and safety",
+    "critics consistently underestimate the cost of doing nothing",
+    "the burden falls hardest on communities with the least political power",
+    "comparable programmes abroad delivered results within five years",
+    "unintended consequences have repeatedly eroded the promised benefits",
+    "public trust depends on transparent and enforceable standards",
+    "the long-run fiscal impact is larger than the headline figures suggest",
+]
+SOURCES = [
+    "World Bank, 2022",
+    "IMF World Economic Outlook, 2023",
+    "Nature, 2021",
+    "OECD Employment Outlook, 2023",
+    "Brookings Institution, 2020",
+    "\"Dr. Jane Smith, Professor of Economics, LSE\"",
+]
+TAGS = ["<b>", "</b>", "<br>", "<em>", "</em>"]
+
+
+class FakeUsage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+
+class FakeResponse:
+    def __init__(self, text: str, usage: Optional[FakeUsage] = None):
+        self.text = text
+        self.usage_metadata = usage
+
+
+def make_argument(rng: random.Random, min_words: int = 300, max_words: int = 500) -> str:
+    """A realistic 300-500 word argument with [Source: ...] citations and the odd stray HTML tag"""
+    words: List[str] = []
+    target = rng.randint(min_words, max_words)
+    while len(words) < target:
+        sentence = rng.choice(PHRASES).split()
+        sentence[0] = sentence[0].capitalize()
+        words.extend(sentence)
+        words[-1] += f" [Source: {rng.choice(SOURCES)}]." if rng.random() < 0.3 else "."
+        if rng.random() < 0.05:
+            words.append(rng.choice(TAGS))
+    sources = sorted(set(rng.sample(SOURCES, 3)))
+    return " ".join(words) + "\n\nSources Referenced:\n" + "\n".join(f"- {source}" for source in sources)
+
+
+class FakeGeminiModel:
+    """Blocking fake with log-normal latency, paced streaming and injectable 429s/5xx errors"""
+
+    def __init__(
+        self,
+        median_latency: float = 2.0,
+        latency_sigma: float = 0.4,
+        time_to_first_chunk: float = 0.5,
+        chunk_words: int = 12,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.median_latency = median_latency
+        self.latency_sigma = latency_sigma
+        self.time_to_first_chunk = time_to_first_chunk
+        self.chunk_words = chunk_words
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rng = random.Random(seed)
+        # The SDK call runs on executor threads, so guard the shared RNG
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def _sample(self):
+        with self.lock:
+            self.calls += 1
+            latency = self.median_latency * self.rng.lognormvariate(0, self.latency_sigma)
+            roll = self.rng.random()
+            text = make_argument(self.rng)
+        return latency, roll, text
+
+    def _maybe_fail(self, roll: float):
+        if roll < self.rate_limit_rate:
+            raise api_exceptions.ResourceExhausted("Resource has been exhausted (e.g. check quota).")
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise api_exceptions.ServiceUnavailable("The service is currently unavailable.")
+
+    def generate_content(self, prompt: str, stream: bool = False, request_options: Optional[dict] = None, **kwargs):
+        latency, roll, text = self._sample()
+        usage = FakeUsage(max(1, len(prompt) // 4), max(1, len(text) // 4))
+        if stream:
+            return self._stream(prompt, latency, roll, text, usage)
+        time.sleep(latency)
+        self._maybe_fail(roll)
+        return FakeResponse(text, usage)
+
+    def count_tokens(self, contents: str, **kwargs):
+        # Used by the agent warm-up; free and fast, like the real endpoint
+        return FakeUsage(max(1, len(contents) // 4), 0)
+
+    def _stream(self, prompt: str, latency: float, roll: float, text: str, usage: FakeUsage) -> Iterator[FakeResponse]:
+        time.sleep(min(self.time_to_first_chunk, latency))
+        self._maybe_fail(roll)
+        words = text.split(" ")
+        chunks = [" ".join(words[i:i + self.chunk_words]) + " " for i in range(0, len(words), self.chunk_words)]
+        # Spread the rest of the sampled latency evenly over the chunks
+        delay = max(0.0, latency - self.time_to_first_chunk) / max(1, len(chunks))
+        for i, chunk in enumerate(chunks):
+            last = i == len(chunks) - 1
+            yield FakeResponse(chunk, usage if last else None)
+            if not last:
+                time.sleep(delay)
@@ -0,0 +1,231 @@
+"""Offline load test for the debate endpoints against a fake Gemini backend.
+
+Drives the FastAPI app in-process at a fixed concurrency and reports latency percentiles,
+throughput and event-loop blocking. Results are written as JSON to diff between releases.
+Run from the backend directory:
+
+    python -m benchmarks.load_test --endpoint /debate --requests 60 --concurrency 12 --output bench.json
+    python -m benchmarks.load_test --baseline bench.json   # compare against an earlier run
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# app.main reads configuration at import time, so set a self-contained environment first
+os.environ.setdefault("GEMINI_API_KEY_1", "fake-key-pro")
+os.environ.setdefault("GEMINI_API_KEY_2", "fake-key-con")
+os.environ.setdefault("GEMINI_API_KEY_3", "fake-key-mediator")
+os.environ.setdefault("FRONTEND_URLS", "http://localhost:3000")
+os.environ.setdefault("DEBATE_JOBS_PATH", os.path.join(tempfile.gettempdir(), "vox_bench_jobs.sqlite3"))
+os.environ.setdefault("DEBATE_ARCHIVE_PATH", os.path.join(tempfile.gettempdir(), "vox_bench_archive.sqlite3"))
+os.environ.setdefault("CITATION_MEMO_PATH", os.path.join(tempfile.gettempdir(), "vox_bench_citations.sqlite3"))
+
+from benchmarks.fake_gemini import FakeGeminiModel  # noqa: E402
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LoopMonitor:
+    """Measures how long the event loop is blocked by sleeping briefly and timing the overshoot"""
+
+    def __init__(self, interval: float = 0.005, threshold: float = 0.002):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: List[float] = []
+        self.task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+    def report(self) -> Dict[str, float]:
+        blocked = [lag for lag in self.lags if lag > self.threshold]
+        return {
+            "max_lag_ms": max(self.lags, default=0) * 1000,
+            "p99_lag_ms": percentile(self.lags, 99) * 1000,
+            "blocked_ms": sum(blocked) * 1000,
+            "blocked_samples": len(blocked),
+        }
+
+
+async def asgi_request(app, method: str, path: str, body: dict) -> Dict[str, object]:
+    """Call the ASGI app directly, timing the first non-empty body chunk as well as the whole response"""
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode())],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    sent = False
+    disconnected = asyncio.Event()
+    response = {"status": None, "ttfb": None}
+    start = time.perf_counter()
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body") and response["ttfb"] is None:
+            response["ttfb"] = time.perf_counter() - start
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        disconnected.set()
+    return {"latency": time.perf_counter() - start, "ttfb": response["ttfb"], "status": response["status"]}
+
+
+def request_body(endpoint: str, topic: str, intensity: str) -> dict:
+    body = {"topic": topic}
+    if endpoint != "/debate":
+        body["intensity"] = intensity
+    return body
+
+
+async def run(args) -> Dict[str, object]:
+    from app import main
+
+    for offset, agent in enumerate(main.agents.values()):
+        # Every model in the agent's route gets its own stub, so fallbacks and hedges are exercised too
+        for index, model_name in enumerate(agent.router.models):
+            agent.router.models[model_name] = FakeGeminiModel(
+                median_latency=args.median_latency,
+                latency_sigma=args.latency_sigma,
+                time_to_first_chunk=args.time_to_first_chunk,
+                error_rate=args.error_rate,
+                rate_limit_rate=args.rate_limit_rate,
+                seed=args.seed * 1000 + offset * 10 + index,
+            )
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    monitor = LoopMonitor()
+
+    async def bounded(i: int):
+        # Distinct topics unless --repeat-topics, so the cache doesn't hide generation cost
+        topic = "Should AI be regulated?" if args.repeat_topics else f"Benchmark topic #{i}"
+        async with semaphore:
+            return await asgi_request(main.app, "POST", args.endpoint, request_body(args.endpoint, topic, args.intensity))
+
+    monitor.start()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bounded(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    await monitor.stop()
+
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["latency"] for r in ok]
+    ttfbs = [r["ttfb"] for r in ok if r["ttfb"] is not None]
+    statuses: Dict[str, int] = {}
+    for r in results:
+        statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+    return {
+        "config": {
+            "endpoint": args.endpoint,
+            "intensity": args.intensity,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "median_latency": args.median_latency,
+            "latency_sigma": args.latency_sigma,
+            "time_to_first_chunk": args.time_to_first_chunk,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+            "repeat_topics": args.repeat_topics,
+            "agent_max_concurrency": main.AGENT_MAX_CONCURRENCY,
+            "routes": {name: agent.router.config._asdict() for name, agent in main.agents.items()},
+            "python": platform.python_version(),
+        },
+        "results": {
+            "elapsed_s": elapsed,
+            "throughput_rps": len(results) / elapsed if elapsed else 0.0,
+            "statuses": statuses,
+            "latency_p50_s": percentile(latencies, 50),
+            "latency_p95_s": percentile(latencies, 95),
+            "latency_p99_s": percentile(latencies, 99),
+            "latency_mean_s": statistics.mean(latencies) if latencies else 0.0,
+            "ttfb_p50_s": percentile(ttfbs, 50),
+            "ttfb_p95_s": percentile(ttfbs, 95),
+            "event_loop": monitor.report(),
+        },
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object]):
+    print(f"\n{'metric':24s} {'baseline':>12s} {'current':>12s} {'change':>9s}")
+    keys = ["throughput_rps", "latency_p50_s", "latency_p95_s", "latency_p99_s", "ttfb_p50_s"]
+    for key in keys:
+        old, new = baseline["results"].get(key, 0), current["results"][key]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{key:24s} {old:12.3f} {new:12.3f} {change:>9s}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", default="/debate", choices=["/debate", "/debate/intense", "/debate/stream"])
+    parser.add_argument("--intensity", default="high")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--median-latency", type=float, default=2.0, help="median fake Gemini latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.4, help="log-normal spread of the latency")
+    parser.add_argument("--time-to-first-chunk", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls failing with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of calls failing with 429")
+    parser.add_argument("--repeat-topics", action="store_true", help="reuse one topic so the cache is exercised")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Benchmarks measure generation, not the cache or upstream quotas, unless asked to.
+    # The synthetic topics differ only by number, so similar-topic reuse would serve nearly all of them.
+    if not args.repeat_topics:
+        os.environ.setdefault("DEBATE_CACHE_BACKEND", "off")
+    os.environ.setdefault("TOPIC_REUSE", "false")
+    os.environ.setdefault("AGENT_RATE_LIMIT_RPM", "0")
+    os.environ.setdefault("AGENT_BACKOFF_BASE", "0.05")
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    json.dump(report["results"], sys.stdout, indent=2, sort_keys=True)
+    print(f"\nWrote {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()